@@ -2,21 +2,41 @@ from __future__ import annotations
 
 import uuid
 
-import asyncio
 import base64
 import binascii
+import re
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import exists, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.dependencies import get_db_session
+from app.api.caching import (
+    APPLICATION_CACHE_CONTROL,
+    etag_matches,
+    not_modified,
+    rows_etag,
+    set_cache_headers,
+)
+from app.api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    apply_keyset,
+    set_next_cursor,
+    split_page,
+)
+from app.api.responses import RowRenderer
+from app.dependencies import get_current_wallet, get_db_session, get_read_db_session
+from app.config import get_settings
 from app.models import (
+    Account,
     AccountRole,
     Application,
     ApplicationPrivateVersion,
+    ApplicationStatus,
     Bounty,
     Deposit,
     DepositStatus,
@@ -28,34 +48,69 @@ from app.schemas import (
     ApplicationResponse,
     DepositCreate,
     DepositResponse,
+    PrivateUrlBatchRequest,
+    PrivateUrlBatchResponse,
+    PrivateUrlResult,
+    PrivateUploadFinalize,
+    PrivateUploadRequest,
+    PrivateUploadResponse,
+    PrivateVersionResponse,
     SampleResumeResponse,
 )
-from app.services.accounts import get_or_create_account
-from app.services.storage import get_private_storage_service
+from app.services.accounts import resolve_account_id, resolve_account_ids
+from app.services.export import ExportFormat, export_response
+from app.services.storage import UploadTooLarge, get_private_storage_service
 
 router = APIRouter(prefix="/applications", tags=["applications"])
 
+_application_rows = RowRenderer(ApplicationResponse)
+
+PRESIGN_BATCH_MAX_ITEMS = get_settings().S3_PRESIGN_BATCH_MAX_ITEMS
+PRIVATE_PAYLOAD_MAX_BYTES = get_settings().PRIVATE_PAYLOAD_MAX_BYTES
+ATTACHMENT_MAX_BYTES = get_settings().ATTACHMENT_MAX_BYTES
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def _safe_filename(filename: str) -> str:
+    name = _UNSAFE_FILENAME_CHARS.sub("_", filename.rsplit("/", 1)[-1]).strip("._")
+    return name[:128] or "attachment"
+
+
+async def _get_own_application(
+    session: AsyncSession, application_id: uuid.UUID, wallet: str
+) -> Application:
+    application = await session.get(Application, application_id)
+    if application is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="application not found")
+    if application.applicant_wallet.strip() != wallet:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="not the applicant for this application"
+        )
+    return application
+
 
 @router.post("", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
 async def create_application(
-    payload: ApplicationCreate, session: AsyncSession = Depends(get_db_session)
+    payload: ApplicationCreate,
+    session: AsyncSession = Depends(get_db_session),
+    wallet: str = Depends(get_current_wallet),
 ):
+    if payload.applicant_wallet.strip() != wallet:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="applicant_wallet does not match the authenticated wallet",
+        )
+
     bounty = await session.get(Bounty, payload.bounty_id)
     if bounty is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="bounty not found")
 
-    applicant_account = await get_or_create_account(
-        session=session,
-        wallet=payload.applicant_wallet,
-        role=AccountRole.CANDIDATE,
-    )
-
+    wallets = {payload.applicant_wallet: AccountRole.CANDIDATE}
     if payload.referrer_wallet:
-        await get_or_create_account(
-            session=session,
-            wallet=payload.referrer_wallet,
-            role=AccountRole.REFERRER,
-        )
+        wallets.setdefault(payload.referrer_wallet, AccountRole.REFERRER)
+    account_ids = await resolve_account_ids(session=session, wallets=wallets)
+    applicant_id = account_ids[payload.applicant_wallet.strip()]
 
     public_profile = payload.public_profile.model_dump()
 
@@ -80,14 +135,14 @@ async def create_application(
         version_id = uuid.uuid4()
         key = storage.build_private_key(application.id, version_id)
         payload_sha256 = storage.compute_sha256(private_bytes)
-        await asyncio.to_thread(storage.put_object, key, private_bytes)
+        await storage.put_object_async(key, private_bytes)
 
         private_version = ApplicationPrivateVersion(
             id=version_id,
             application_id=application.id,
             s3_key=key,
             payload_sha256=payload_sha256,
-            uploaded_by_id=applicant_account.id,
+            uploaded_by_id=applicant_id,
         )
         session.add(private_version)
         await session.flush()
@@ -99,11 +154,48 @@ async def create_application(
 
 
 @router.get("", response_model=list[ApplicationResponse])
-async def list_applications(session: AsyncSession = Depends(get_db_session)):
-    result = await session.execute(
-        select(Application).options(selectinload(Application.bounty))
-    )
-    return result.scalars().unique().all()
+async def list_applications(
+    request: Request,
+    response: Response,
+    bounty_id: uuid.UUID | None = Query(default=None, description="Filter by bounty"),
+    status_: ApplicationStatus | None = Query(
+        default=None, alias="status", description="Filter by application status"
+    ),
+    applicant_wallet: str | None = Query(default=None, description="Filter by applicant wallet"),
+    referrer_wallet: str | None = Query(default=None, description="Filter by referrer wallet"),
+    cursor: str | None = Query(
+        default=None, description="Opaque cursor from the previous page's X-Next-Cursor header"
+    ),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_read_db_session),
+):
+    stmt = select(Application)
+
+    if bounty_id:
+        stmt = stmt.where(Application.bounty_id == bounty_id)
+    if status_:
+        stmt = stmt.where(Application.status == status_)
+    if applicant_wallet:
+        stmt = stmt.where(Application.applicant_wallet == applicant_wallet.strip())
+    if referrer_wallet:
+        stmt = stmt.where(Application.referrer_wallet == referrer_wallet.strip())
+
+    result = await session.execute(apply_keyset(stmt, Application, cursor, limit))
+    applications, next_cursor = split_page(result.scalars().all(), limit)
+    etag = rows_etag(applications, next_cursor)
+    if etag_matches(request, etag):
+        return not_modified(etag, APPLICATION_CACHE_CONTROL)
+    set_next_cursor(response, next_cursor)
+    set_cache_headers(response, etag, APPLICATION_CACHE_CONTROL)
+    return _application_rows.render(applications, response)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_applications(
+    format: ExportFormat = Query(default="ndjson", description="ndjson or csv"),
+):
+    stmt = select(Application).order_by(Application.created_at, Application.id)
+    return export_response(stmt, ApplicationResponse, format, filename="applications")
 
 
 @router.get("/sample-resume", response_model=SampleResumeResponse)
@@ -145,22 +237,271 @@ async def get_sample_resume() -> SampleResumeResponse:
     return SampleResumeResponse(public_profile=public_profile, private_profile=private_profile)
 
 
-@router.get("/{application_id}", response_model=ApplicationResponse)
-async def get_application(
-    application_id: uuid.UUID = Path(...),
+@router.post("/private-urls", response_model=PrivateUrlBatchResponse)
+async def presign_private_urls(
+    payload: PrivateUrlBatchRequest,
+    response: Response,
     session: AsyncSession = Depends(get_db_session),
+    wallet: str = Depends(get_current_wallet),
 ):
+    """Download URLs for the current private payload of many applications.
+
+    A URL is only issued to the recruiter who owns the application's bounty,
+    and only once contact access was granted: ``access_granted_at`` is set or
+    that recruiter has a cleared deposit on the application. Other items
+    carry an ``error``. The check reads the primary so a just-cleared deposit
+    counts. URLs are signed locally and reused while most of their lifetime
+    remains, so repeated calls for a candidate list are cheap.
+    """
+    if len(payload.application_ids) > PRESIGN_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"at most {PRESIGN_BATCH_MAX_ITEMS} applications per batch",
+        )
+
     result = await session.execute(
-        select(Application)
-            .options(selectinload(Application.bounty))
-            .where(Application.id == application_id)
+        select(
+            Application.id,
+            Account.wallet,
+            or_(
+                Application.access_granted_at.is_not(None),
+                exists().where(
+                    Deposit.application_id == Application.id,
+                    Deposit.recruiter_id == Bounty.recruiter_id,
+                    Deposit.status == DepositStatus.CLEARED,
+                ),
+            ),
+            ApplicationPrivateVersion.id,
+            ApplicationPrivateVersion.s3_key,
+        )
+        .join(Bounty, Application.bounty_id == Bounty.id)
+        .join(Account, Bounty.recruiter_id == Account.id)
+        .outerjoin(
+            ApplicationPrivateVersion,
+            Application.private_current_version_id == ApplicationPrivateVersion.id,
+        )
+        .where(Application.id.in_(set(payload.application_ids)))
     )
-    application = result.scalar_one_or_none()
+    rows = {row[0]: row for row in result.all()}
+
+    results: list[PrivateUrlResult] = []
+    granted: list[tuple[PrivateUrlResult, str]] = []
+    for application_id in payload.application_ids:
+        item = PrivateUrlResult(application_id=application_id)
+        results.append(item)
+        row = rows.get(application_id)
+        if row is None:
+            item.error = "application not found"
+            continue
+        _, recruiter_wallet, access_granted, version_id, s3_key = row
+        if recruiter_wallet != wallet:
+            item.error = "not the recruiter for this bounty"
+            continue
+        if not access_granted:
+            item.error = "contact access not granted"
+            continue
+        if s3_key is None:
+            item.error = "no private payload"
+            continue
+        item.version_id = version_id
+        granted.append((item, s3_key))
+
+    urls = get_private_storage_service().generate_get_urls(key for _, key in granted)
+    for item, s3_key in granted:
+        item.url = urls[s3_key].url
+        item.expires_in = urls[s3_key].expires_in
+
+    # The URLs are bearer credentials for applicant data.
+    response.headers["Cache-Control"] = "private, no-store"
+    return PrivateUrlBatchResponse(results=results)
+
+
+@router.get("/{application_id}", response_model=ApplicationResponse)
+async def get_application(
+    request: Request,
+    response: Response,
+    application_id: uuid.UUID = Path(...),
+    session: AsyncSession = Depends(get_read_db_session),
+):
+    application = await session.get(Application, application_id)
     if application is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="application not found")
+    etag = rows_etag([application])
+    if etag_matches(request, etag):
+        return not_modified(etag, APPLICATION_CACHE_CONTROL)
+    set_cache_headers(response, etag, APPLICATION_CACHE_CONTROL)
     return application
 
 
+@router.post("/{application_id}/private-upload", response_model=PrivateUploadResponse)
+async def start_private_upload(
+    application_id: uuid.UUID,
+    payload: PrivateUploadRequest,
+    session: AsyncSession = Depends(get_db_session),
+    wallet: str = Depends(get_current_wallet),
+):
+    """Presigned PUT for a new private profile version, uploaded straight to storage.
+
+    The URL is bound to the declared size and SHA-256, so storage rejects
+    any other body. Call ``finalize`` once the upload succeeded.
+    """
+    if payload.size > PRIVATE_PAYLOAD_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"private payload is limited to {PRIVATE_PAYLOAD_MAX_BYTES} bytes",
+        )
+    await _get_own_application(session, application_id, wallet)
+
+    storage = get_private_storage_service()
+    version_id = uuid.uuid4()
+    key = storage.build_private_key(application_id, version_id)
+    presigned = await storage.presign_checked_put(
+        key, payload.sha256, payload.size, payload.content_type
+    )
+    return PrivateUploadResponse(
+        version_id=version_id,
+        s3_key=key,
+        url=presigned.url,
+        headers=presigned.fields,
+        expires_in=presigned.expires_in,
+    )
+
+
+@router.post(
+    "/{application_id}/private-upload/{version_id}/finalize",
+    response_model=PrivateVersionResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def finalize_private_upload(
+    application_id: uuid.UUID,
+    version_id: uuid.UUID,
+    payload: PrivateUploadFinalize,
+    session: AsyncSession = Depends(get_db_session),
+    wallet: str = Depends(get_current_wallet),
+):
+    """Record an uploaded private profile as the application's current version.
+
+    Size and checksum come from the stored object's metadata; the payload
+    itself never passes through the API.
+    """
+    application = await _get_own_application(session, application_id, wallet)
+
+    existing = await session.get(ApplicationPrivateVersion, version_id)
+    if existing is not None:
+        if existing.application_id != application_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="version not found")
+        return existing
+
+    storage = get_private_storage_service()
+    key = storage.build_private_key(application_id, version_id)
+    metadata = await storage.head_object_async(key)
+    if metadata is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="upload not found")
+    if metadata.size != payload.size or metadata.checksum_sha256 != payload.sha256:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="uploaded object does not match the declared size and checksum",
+        )
+
+    applicant_id = await resolve_account_id(
+        session=session, wallet=wallet, role=AccountRole.CANDIDATE
+    )
+    private_version = ApplicationPrivateVersion(
+        id=version_id,
+        application_id=application.id,
+        s3_key=key,
+        payload_sha256=metadata.checksum_sha256,
+        uploaded_by_id=applicant_id,
+    )
+    session.add(private_version)
+    try:
+        await session.flush()
+    except IntegrityError as exc:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="payload already uploaded"
+        ) from exc
+    application.private_current_version_id = private_version.id
+    await session.commit()
+    await session.refresh(private_version)
+    return private_version
+
+
+@router.post(
+    "/{application_id}/attachments",
+    response_model=PrivateVersionResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def upload_attachment(
+    application_id: uuid.UUID,
+    request: Request,
+    filename: str = Query(..., min_length=1, max_length=255),
+    session: AsyncSession = Depends(get_db_session),
+    wallet: str = Depends(get_current_wallet),
+):
+    """Stream the raw request body to storage as an application attachment.
+
+    The body is never held in memory as a whole: it is hashed and uploaded
+    in multipart chunks as it arrives. Attachments share the per-application
+    payload hash constraint with private profile versions, so bytes already
+    stored for the application, as either kind, are rejected with 409.
+    """
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > ATTACHMENT_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"attachments are limited to {ATTACHMENT_MAX_BYTES} bytes",
+        )
+    if declared == "0":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="empty attachment")
+    application = await _get_own_application(session, application_id, wallet)
+    applicant_id = await resolve_account_id(
+        session=session, wallet=wallet, role=AccountRole.CANDIDATE
+    )
+    # Hand the connection back to the pool while the body streams in.
+    await session.commit()
+
+    storage = get_private_storage_service()
+    version_id = uuid.uuid4()
+    key = storage.build_attachment_key(application.id, version_id, _safe_filename(filename))
+    try:
+        upload = await storage.upload_stream(
+            key,
+            request.stream(),
+            content_type=request.headers.get("content-type", "application/octet-stream"),
+            max_bytes=ATTACHMENT_MAX_BYTES,
+        )
+    except UploadTooLarge as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"attachments are limited to {exc.max_bytes} bytes",
+        ) from exc
+    if upload.size == 0:
+        # Chunked bodies carry no Content-Length to reject up front.
+        await storage.delete_object_async(key)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="empty attachment")
+
+    attachment = ApplicationPrivateVersion(
+        id=version_id,
+        application_id=application.id,
+        s3_key=key,
+        payload_sha256=upload.sha256,
+        uploaded_by_id=applicant_id,
+    )
+    session.add(attachment)
+    try:
+        await session.commit()
+    except IntegrityError as exc:
+        await session.rollback()
+        await storage.delete_object_async(key)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="identical payload already uploaded for this application",
+        ) from exc
+    await session.refresh(attachment)
+    return attachment
+
+
 @router.post(
     "/{application_id}/deposit",
     response_model=DepositResponse,
@@ -170,7 +511,14 @@ async def record_deposit(
     application_id: uuid.UUID,
     payload: DepositCreate,
     session: AsyncSession = Depends(get_db_session),
+    wallet: str = Depends(get_current_wallet),
 ):
+    if payload.recruiter_wallet.strip() != wallet:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="recruiter_wallet does not match the authenticated wallet",
+        )
+
     result = await session.execute(
         select(Application)
         .options(selectinload(Application.bounty))
@@ -180,13 +528,13 @@ async def record_deposit(
     if application is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="application not found")
 
-    recruiter_account = await get_or_create_account(
+    recruiter_id = await resolve_account_id(
         session=session,
         wallet=payload.recruiter_wallet,
         role=AccountRole.RECRUITER,
     )
 
-    if application.bounty.recruiter_id != recruiter_account.id:
+    if application.bounty.recruiter_id != recruiter_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="recruiter does not own the bounty for this application",
@@ -194,7 +542,7 @@ async def record_deposit(
 
     deposit = Deposit(
         application_id=application.id,
-        recruiter_id=recruiter_account.id,
+        recruiter_id=recruiter_id,
         amount=Decimal(str(payload.amount)),
         tx_signature=payload.tx_signature,
         status=DepositStatus.PENDING,
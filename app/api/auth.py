@@ -1,27 +1,32 @@
 from __future__ import annotations
 
 import secrets
-import threading
-import time
 from datetime import timedelta
-from typing import Dict
 
 from fastapi import APIRouter, Body, HTTPException, Request, Response, status
 
 from app.auth.auth import (
     build_message,
-    decode_jwt,
+    decode_jwt_cached,
+    decode_signature,
     format_ts,
     get_token_from_request,
+    load_verify_key,
     mint_jwt,
     now_utc,
-    verify_signature_solana_base58_pubkey_message_signature,
+    require_signature_backend,
+    verify_ed25519_batch,
+    verify_signature_async,
 )
+from app.auth.challenges import get_challenge_store
 from app.schemas.auth import (
     ChallengeRecord,
     ChallengeRequest,
     ChallengeResponse,
     MeResponse,
+    VerifyBatchItemResult,
+    VerifyBatchRequest,
+    VerifyBatchResponse,
     VerifyRequest,
     VerifyResponse,
 )
@@ -31,6 +36,7 @@ settings = get_settings()
 
 DEFAULT_DOMAIN = settings.AUTH_DOMAIN
 CHALLENGE_TTL_SECONDS = settings.AUTH_CHALLENGE_TTL_SECONDS
+VERIFY_BATCH_MAX_ITEMS = settings.AUTH_VERIFY_BATCH_MAX_ITEMS
 
 # JWT config
 JWT_SECRET = settings.JWT_SECRET
@@ -49,25 +55,8 @@ JWT_COOKIE_PARTITIONED = settings.JWT_COOKIE_PARTITIONED
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-_challenges: Dict[str, ChallengeRecord] = {}
-_lock = threading.Lock()
-
-
-def _sweep_expired() -> None:
-    while True:
-        now = now_utc()
-        with _lock:
-            for key, value in list(_challenges.items()):
-                if value.expires_at < now:
-                    _challenges.pop(key, None)
-        time.sleep(60)
-
-
-threading.Thread(target=_sweep_expired, daemon=True).start()
-
-
 @router.post("/challenge", response_model=ChallengeResponse)
-def create_challenge(payload: ChallengeRequest = Body(...)):
+async def create_challenge(payload: ChallengeRequest = Body(...)):
     domain = payload.domain or DEFAULT_DOMAIN
     if not payload.wallet or len(payload.wallet) < 20:
         raise HTTPException(status_code=400, detail="invalid wallet")
@@ -88,8 +77,7 @@ def create_challenge(payload: ChallengeRequest = Body(...)):
         domain=domain,
         message=message,
     )
-    with _lock:
-        _challenges[nonce] = rec
+    await get_challenge_store().put(rec)
 
     return ChallengeResponse(
         wallet=payload.wallet,
@@ -101,20 +89,15 @@ def create_challenge(payload: ChallengeRequest = Body(...)):
 
 
 @router.post("/verify", response_model=VerifyResponse)
-def verify_challenge(response: Response, payload: VerifyRequest = Body(...)):
-    with _lock:
-        rec = _challenges.get(payload.nonce)
-        if rec is None:
-            raise HTTPException(400, "unknown or expired nonce")
-        if rec.used:
-            raise HTTPException(400, "nonce already used")
-        if now_utc() > rec.expires_at:
-            _challenges.pop(payload.nonce, None)
-            raise HTTPException(400, "nonce expired")
-        rec.used = True
-        _challenges.pop(payload.nonce, None)
-
-    ok = verify_signature_solana_base58_pubkey_message_signature(
+async def verify_challenge(response: Response, payload: VerifyRequest = Body(...)):
+    # Consuming removes the nonce for every worker, so it can only be used once.
+    rec = await get_challenge_store().consume(payload.nonce)
+    if rec is None:
+        raise HTTPException(400, "unknown or expired nonce")
+    if now_utc() > rec.expires_at:
+        raise HTTPException(400, "nonce expired")
+
+    ok = await verify_signature_async(
         rec.wallet, rec.message, payload.signature, payload.signature_encoding
     )
     if not ok:
@@ -144,8 +127,67 @@ def verify_challenge(response: Response, payload: VerifyRequest = Body(...)):
     )
 
 
+@router.post("/verify/batch", response_model=VerifyBatchResponse)
+async def verify_challenge_batch(payload: VerifyBatchRequest = Body(...)):
+    """Verify many challenge signatures at once, returning a result per item.
+
+    Each verified item gets its own bearer token; no cookie is set.
+    """
+    if len(payload.items) > VERIFY_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"at most {VERIFY_BATCH_MAX_ITEMS} items per batch",
+        )
+
+    require_signature_backend()
+    store = get_challenge_store()
+    results: list[VerifyBatchItemResult] = []
+    records: dict[int, ChallengeRecord] = {}
+    jobs: list[tuple[bytes, bytes, bytes]] = []
+    job_items: list[int] = []
+    pubkeys: dict[str, bytes] = {}
+
+    for index, item in enumerate(payload.items):
+        results.append(VerifyBatchItemResult(ok=False, used_nonce=item.nonce))
+        rec = await store.consume(item.nonce)
+        if rec is None:
+            results[index].error = "unknown or expired nonce"
+            continue
+        results[index].wallet = rec.wallet
+        if now_utc() > rec.expires_at:
+            results[index].error = "nonce expired"
+            continue
+
+        try:
+            # Wallets repeat across a login burst; decode each key once per batch.
+            pubkey_bytes = pubkeys.get(rec.wallet)
+            if pubkey_bytes is None:
+                pubkey_bytes = pubkeys[rec.wallet] = load_verify_key(rec.wallet).encode()
+            sig_bytes = decode_signature(item.signature, item.signature_encoding)
+        except HTTPException as exc:
+            results[index].error = exc.detail
+            continue
+
+        records[index] = rec
+        jobs.append((pubkey_bytes, rec.message.encode("utf-8"), sig_bytes))
+        job_items.append(index)
+
+    verified = await verify_ed25519_batch(jobs)
+    for index, ok in zip(job_items, verified):
+        if not ok:
+            results[index].error = "invalid signature"
+            continue
+        rec = records[index]
+        token, exp = mint_jwt(rec.wallet, rec.nonce, rec.purpose, rec.domain)
+        results[index].ok = True
+        results[index].token = token
+        results[index].token_expires_at = format_ts(exp)
+
+    return VerifyBatchResponse(results=results)
+
+
 @router.post("/logout")
-def logout(response: Response):
+async def logout(response: Response):
     response.delete_cookie(
         key=JWT_COOKIE_NAME,
         domain=JWT_COOKIE_DOMAIN,
@@ -156,14 +198,14 @@ def logout(response: Response):
 
 
 @router.get("/me", response_model=MeResponse)
-def auth_me(request: Request):
+async def auth_me(request: Request):
     token = get_token_from_request(request)
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="missing token"
         )
     try:
-        payload = decode_jwt(token)
+        payload = decode_jwt_cached(token)
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid token"
@@ -1,32 +1,177 @@
 from __future__ import annotations
 
 import uuid
-from typing import List
+from dataclasses import dataclass
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_db_session
-from app.models import AccountRole, Bounty
+from app.api.caching import (
+    BOUNTY_CACHE_CONTROL,
+    etag_matches,
+    not_modified,
+    rows_etag,
+    set_cache_headers,
+)
+from app.api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    apply_keyset,
+    decode_rank_cursor,
+    encode_rank_cursor,
+    set_next_cursor,
+    split_page,
+)
+from app.api.responses import RowRenderer
+from app.db import get_session
+from app.dependencies import (
+    get_current_wallet,
+    get_db_session,
+    get_read_db_session,
+    reads_from_primary,
+)
+from app.models import Account, AccountRole, Bounty
+from app.models.entities import BOUNTY_SEARCH_CONFIG
 from app.schemas import BountyCreate, BountyResponse, BountyUpdate
-from app.services.accounts import get_or_create_account
+from app.services.accounts import resolve_account_id
+from app.services.bounty_board import bounty_board_cache, notify_bounty_board_changed
+from app.services.export import ExportFormat, export_response
 
 router = APIRouter(prefix="/bounties", tags=["bounties"])
 
+MatchMode = Literal["contains", "prefix", "exact"]
+
+_bounty_rows = RowRenderer(BountyResponse)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _text_filter(column, value: str, match: MatchMode):
+    """Build a filter the bounty text indexes can serve.
+
+    ``exact`` hits the plain B-tree index and expects the stored (normalized)
+    value; ``prefix`` and ``contains`` are case-insensitive and go through the
+    pg_trgm GIN indexes.
+    """
+    if match == "exact":
+        return column == value
+    pattern = _escape_like(value)
+    if match == "prefix":
+        return column.ilike(f"{pattern}%", escape="\\")
+    return column.ilike(f"%{pattern}%", escape="\\")
+
+
+@dataclass(frozen=True)
+class BountyBoardFilters:
+    company: Optional[str]
+    region: Optional[str]
+    employment_type: Optional[str]
+    match: MatchMode
+    skill: Optional[str]
+    cursor: Optional[str]
+    limit: int
+
+    @classmethod
+    def normalized(
+        cls,
+        *,
+        company: Optional[str],
+        region: Optional[str],
+        employment_type: Optional[str],
+        match: MatchMode,
+        skill: Optional[str],
+        cursor: Optional[str],
+        limit: int,
+    ) -> "BountyBoardFilters":
+        """Collapse requests that are guaranteed the same page onto one cache key.
+
+        ``contains``/``prefix`` match case-insensitively, so their values are
+        lowercased; ``exact`` values are kept as given. Empty strings mean no
+        filter, as in the query below.
+        """
+
+        def text(value: Optional[str]) -> Optional[str]:
+            if not value:
+                return None
+            return value if match == "exact" else value.lower()
+
+        return cls(
+            company=text(company),
+            region=text(region),
+            employment_type=text(employment_type),
+            match=match,
+            skill=skill.strip().lower() if skill else None,
+            cursor=cursor or None,
+            limit=limit,
+        )
+
+
+@dataclass(frozen=True)
+class BountyBoardPage:
+    body: bytes
+    etag: str
+    next_cursor: Optional[str]
+
+
+async def _load_bounty_board_page(filters: BountyBoardFilters) -> BountyBoardPage:
+    # Read from the primary: a page loaded from a lagging replica right after
+    # an invalidation would otherwise stay cached until its TTL runs out.
+    stmt = select(Bounty)
+    if filters.company:
+        stmt = stmt.where(_text_filter(Bounty.company, filters.company, filters.match))
+    if filters.region:
+        stmt = stmt.where(_text_filter(Bounty.region, filters.region, filters.match))
+    if filters.employment_type:
+        stmt = stmt.where(
+            _text_filter(Bounty.employment_type, filters.employment_type, filters.match)
+        )
+    if filters.skill is not None:
+        stmt = stmt.where(Bounty.skills_normalized.contains([filters.skill]))
+
+    async with get_session() as session:
+        result = await session.execute(
+            apply_keyset(stmt, Bounty, filters.cursor, filters.limit)
+        )
+        bounties, next_cursor = split_page(result.scalars().all(), filters.limit)
+        return BountyBoardPage(
+            body=_bounty_rows.dumps(bounties),
+            etag=rows_etag(bounties, next_cursor),
+            next_cursor=next_cursor,
+        )
+
+
+async def _bounty_board_changed(session: AsyncSession) -> None:
+    """Commit a bounty write and drop every worker's cached board pages."""
+    await notify_bounty_board_changed(session)
+    await session.commit()
+    bounty_board_cache.invalidate()
+
 
 @router.post("", response_model=BountyResponse, status_code=status.HTTP_201_CREATED)
 async def create_bounty(
-    payload: BountyCreate, session: AsyncSession = Depends(get_db_session)
+    payload: BountyCreate,
+    session: AsyncSession = Depends(get_db_session),
+    wallet: str = Depends(get_current_wallet),
 ):
-    recruiter = await get_or_create_account(
+    if payload.recruiter_wallet.strip() != wallet:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="recruiter_wallet does not match the authenticated wallet",
+        )
+
+    recruiter_id = await resolve_account_id(
         session=session,
         wallet=payload.recruiter_wallet,
         role=AccountRole.RECRUITER,
     )
 
     bounty = Bounty(
-        recruiter_id=recruiter.id,
+        recruiter_id=recruiter_id,
         title=payload.title,
         description=payload.description,
         reward_amount=payload.reward_amount,
@@ -38,44 +183,102 @@ async def create_bounty(
         expires_at=payload.expires_at,
     )
     session.add(bounty)
-    await session.commit()
+    await _bounty_board_changed(session)
     await session.refresh(bounty)
     return bounty
 
 
 @router.get("", response_model=list[BountyResponse])
 async def list_bounties(
+    request: Request,
     company: str | None = Query(default=None, description="Filter by company name"),
     region: str | None = Query(default=None, description="Filter by region"),
     employment_type: str | None = Query(
         default=None, description="Filter by employment type"
     ),
+    match: MatchMode = Query(
+        default="contains",
+        description="How company/region/employment_type are matched: contains, prefix or exact",
+    ),
     skill: str | None = Query(
-        default=None, description="Filter by required skill (case-insensitive)"
+        default=None, description="Filter by required skill (case-insensitive exact match)"
     ),
-    session: AsyncSession = Depends(get_db_session),
+    cursor: str | None = Query(
+        default=None, description="Opaque cursor from the previous page's X-Next-Cursor header"
+    ),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
 ):
-    stmt = select(Bounty).order_by(Bounty.created_at.desc())
+    filters = BountyBoardFilters.normalized(
+        company=company,
+        region=region,
+        employment_type=employment_type,
+        match=match,
+        skill=skill,
+        cursor=cursor,
+        limit=limit,
+    )
+    if reads_from_primary(request):
+        # Just wrote: another worker may not have seen the NOTIFY yet.
+        page = await _load_bounty_board_page(filters)
+    else:
+        page = await bounty_board_cache.get_or_load(
+            filters, lambda: _load_bounty_board_page(filters)
+        )
 
-    if company:
-        stmt = stmt.where(Bounty.company.ilike(f"%{company}%"))
-    if region:
-        stmt = stmt.where(Bounty.region.ilike(f"%{region}%"))
-    if employment_type:
-        stmt = stmt.where(Bounty.employment_type.ilike(f"%{employment_type}%"))
+    if etag_matches(request, page.etag):
+        return not_modified(page.etag, BOUNTY_CACHE_CONTROL)
+    response = Response(content=page.body, media_type="application/json")
+    set_next_cursor(response, page.next_cursor)
+    set_cache_headers(response, page.etag, BOUNTY_CACHE_CONTROL)
+    return response
 
-    result = await session.execute(stmt)
-    bounties: List[Bounty] = result.scalars().all()
 
-    if skill:
-        skill_lower = skill.lower()
-        bounties = [
-            bounty
-            for bounty in bounties
-            if any(s.lower() == skill_lower or skill_lower in s.lower() for s in bounty.skills or [])
-        ]
+@router.get("/export", response_class=StreamingResponse)
+async def export_bounties(
+    format: ExportFormat = Query(default="ndjson", description="ndjson or csv"),
+):
+    stmt = select(Bounty).order_by(Bounty.created_at, Bounty.id)
+    return export_response(stmt, BountyResponse, format, filename="bounties")
 
-    return bounties
+
+@router.get("/search", response_model=list[BountyResponse])
+async def search_bounties(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=256, description="Web-style search query"),
+    cursor: str | None = Query(
+        default=None, description="Opaque cursor from the previous page's X-Next-Cursor header"
+    ),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_read_db_session),
+):
+    """Rank bounties by relevance over title, company, skills and description."""
+    query = func.websearch_to_tsquery(BOUNTY_SEARCH_CONFIG, q)
+    rank = func.ts_rank(Bounty.search_vector, query).label("rank")
+
+    stmt = (
+        select(Bounty, rank)
+        .where(Bounty.search_vector.bool_op("@@")(query))
+        .order_by(rank.desc(), Bounty.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        last_rank, last_id = decode_rank_cursor(cursor)
+        stmt = stmt.where(tuple_(rank, Bounty.id) < (last_rank, last_id))
+
+    result = await session.execute(stmt)
+    rows = result.all()
+    next_cursor = None
+    if len(rows) > limit:
+        last_bounty, last_rank = rows[limit - 1]
+        next_cursor = encode_rank_cursor(last_rank, last_bounty.id)
+    bounties = [bounty for bounty, _ in rows[:limit]]
+    etag = rows_etag(bounties, next_cursor)
+    if etag_matches(request, etag):
+        return not_modified(etag, BOUNTY_CACHE_CONTROL)
+    set_next_cursor(response, next_cursor)
+    set_cache_headers(response, etag, BOUNTY_CACHE_CONTROL)
+    return _bounty_rows.render(bounties, response)
 
 
 @router.patch("/{bounty_id}", response_model=BountyResponse)
@@ -83,11 +286,21 @@ async def update_bounty(
     bounty_id: uuid.UUID,
     payload: BountyUpdate,
     session: AsyncSession = Depends(get_db_session),
+    wallet: str = Depends(get_current_wallet),
 ):
-    result = await session.execute(select(Bounty).where(Bounty.id == bounty_id))
-    bounty = result.scalar_one_or_none()
-    if bounty is None:
+    result = await session.execute(
+        select(Bounty, Account.wallet)
+        .join(Account, Bounty.recruiter_id == Account.id)
+        .where(Bounty.id == bounty_id)
+    )
+    row = result.one_or_none()
+    if row is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="bounty not found")
+    bounty, recruiter_wallet = row
+    if recruiter_wallet != wallet:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="not the recruiter for this bounty"
+        )
 
     update_data = payload.model_dump(exclude_unset=True)
     if "skills" in update_data and update_data["skills"] is not None:
@@ -96,6 +309,6 @@ async def update_bounty(
     for field, value in update_data.items():
         setattr(bounty, field, value)
 
-    await session.commit()
+    await _bounty_board_changed(session)
     await session.refresh(bounty)
     return bounty
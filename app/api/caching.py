@@ -0,0 +1,65 @@
+"""Conditional GET (ETag / If-None-Match) and Cache-Control helpers."""
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Iterable
+
+from fastapi import Request, Response, status
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Public board: browsers always revalidate (cheap with ETags), the CDN may
+# serve a copy for a few seconds and refresh it in the background.
+BOUNTY_CACHE_CONTROL = (
+    f"public, max-age=0, s-maxage={settings.BOUNTY_CACHE_S_MAXAGE_SECONDS}, "
+    f"stale-while-revalidate={settings.BOUNTY_CACHE_STALE_WHILE_REVALIDATE_SECONDS}"
+)
+# Applications carry applicant data: never stored by shared caches.
+APPLICATION_CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\x00")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def rows_etag(rows: Iterable[Any], *extra: Any) -> str:
+    """ETag for a page of rows, from each row's ``id`` and ``updated_at``.
+
+    Both are bumped by any write to a row, so the tag changes whenever the
+    rendered page would.
+    """
+    return weak_etag(*extra, *(f"{row.id}@{row.updated_at.isoformat()}" for row in rows))
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison against ``If-None-Match``, as RFC 9110 requires for GET."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = _opaque(etag)
+    return any(_opaque(tag) == wanted for tag in header.split(","))
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Empty ``304`` carrying the validators the ``200`` would have had."""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag, cache_control)
+    return response
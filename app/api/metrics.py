@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from fastapi import APIRouter, Response
+
+from app.auth.challenges import get_challenge_store
+from app.db import get_pool_stats
+from app.services.accounts import account_cache_stats
+from app.services.bounty_board import bounty_board_cache
+from app.services.metrics import PROMETHEUS_CONTENT_TYPE, MetricFamily, registry
+from app.services.sql_stats import sql_stats_snapshot
+from app.services.storage import presign_cache_stats, storage_requests_in_flight
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+def _collect_runtime_gauges() -> Iterable[MetricFamily]:
+    pools = get_pool_stats()
+    for name, stat, metric_type, help_text in (
+        ("db_pool_size", "size", "gauge", "Configured persistent connections."),
+        ("db_pool_checked_out", "checked_out", "gauge", "Connections currently checked out."),
+        ("db_pool_overflow", "overflow", "gauge", "Connections open beyond the pool size."),
+        ("db_pool_acquires_total", "acquire_count", "counter", "Connection checkouts."),
+        (
+            "db_pool_acquire_timeouts_total",
+            "acquire_timeouts",
+            "counter",
+            "Checkouts that timed out waiting for a connection.",
+        ),
+        (
+            "db_pool_acquire_wait_seconds_total",
+            "acquire_wait_seconds_total",
+            "counter",
+            "Total time spent waiting for a connection.",
+        ),
+        (
+            "db_pool_acquire_wait_seconds_max",
+            "acquire_wait_seconds_max",
+            "gauge",
+            "Longest wait for a connection.",
+        ),
+    ):
+        yield name, metric_type, help_text, [
+            (name, {"pool": pool}, stats[stat]) for pool, stats in pools.items()
+        ]
+
+    outstanding = get_challenge_store().outstanding()
+    if outstanding is not None:
+        yield "auth_challenges_outstanding", "gauge", "Issued, unconsumed sign-in challenges.", [
+            ("auth_challenges_outstanding", {}, outstanding)
+        ]
+
+    yield "storage_requests_in_flight", "gauge", "Async S3 requests in flight, retries included.", [
+        ("storage_requests_in_flight", {}, storage_requests_in_flight())
+    ]
+
+    presign = presign_cache_stats()
+    yield "presign_cache_entries", "gauge", "Presigned GET URLs held for reuse.", [
+        ("presign_cache_entries", {}, presign["size"])
+    ]
+    yield "presign_cache_requests_total", "counter", "Presigned GET URL lookups by result.", [
+        ("presign_cache_requests_total", {"result": "hit"}, presign["hits"]),
+        ("presign_cache_requests_total", {"result": "miss"}, presign["misses"]),
+    ]
+
+    cache = account_cache_stats()
+    yield "account_cache_entries", "gauge", "Wallets held in the account cache.", [
+        ("account_cache_entries", {}, cache["size"])
+    ]
+    yield "account_cache_requests_total", "counter", "Account cache lookups by result.", [
+        ("account_cache_requests_total", {"result": "hit"}, cache["hits"]),
+        ("account_cache_requests_total", {"result": "miss"}, cache["misses"]),
+    ]
+
+    board = bounty_board_cache.stats()
+    yield "bounty_board_cache_entries", "gauge", "Rendered bounty board pages cached.", [
+        ("bounty_board_cache_entries", {}, board["size"])
+    ]
+    yield "bounty_board_cache_requests_total", "counter", "Bounty board cache lookups by result.", [
+        ("bounty_board_cache_requests_total", {"result": "hit"}, board["hits"]),
+        ("bounty_board_cache_requests_total", {"result": "miss"}, board["misses"]),
+        ("bounty_board_cache_requests_total", {"result": "coalesced"}, board["coalesced"]),
+    ]
+    yield "bounty_board_cache_invalidations_total", "counter", "Bounty board invalidations.", [
+        ("bounty_board_cache_invalidations_total", {}, board["version"])
+    ]
+
+    routes = sql_stats_snapshot()
+    yield "sql_statements_total", "counter", "SQL statements issued per route template.", [
+        ("sql_statements_total", {"route": route}, totals["statements"])
+        for route, totals in routes.items()
+    ]
+    yield "sql_duration_seconds_total", "counter", "Time spent in SQL per route template.", [
+        ("sql_duration_seconds_total", {"route": route}, totals["db_seconds"])
+        for route, totals in routes.items()
+    ]
+
+
+registry.register_collector(_collect_runtime_gauges)
+
+
+@router.get("")
+async def read_metrics() -> Response:
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get("/sql")
+async def read_sql_stats() -> dict[str, dict[str, int | float]]:
+    return sql_stats_snapshot()
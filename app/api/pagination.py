@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, tuple_
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _pack(values: list[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _unpack(cursor: str) -> list[Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid cursor")
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    return _pack([created_at.isoformat(), str(row_id)])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        created_at_raw, row_id_raw = _unpack(cursor)
+        return datetime.fromisoformat(created_at_raw), uuid.UUID(row_id_raw)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise _invalid_cursor() from exc
+
+
+def encode_rank_cursor(rank: float, row_id: uuid.UUID) -> str:
+    return _pack([rank, str(row_id)])
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, uuid.UUID]:
+    try:
+        rank_raw, row_id_raw = _unpack(cursor)
+        return float(rank_raw), uuid.UUID(row_id_raw)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise _invalid_cursor() from exc
+
+
+def apply_keyset(stmt: Select, model: Any, cursor: Optional[str], limit: int) -> Select:
+    """Order newest-first on (created_at, id) and seek past the given cursor.
+
+    One extra row is fetched so callers can tell whether another page exists.
+    """
+    stmt = stmt.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(model.created_at, model.id) < (created_at, row_id))
+    return stmt.limit(limit + 1)
+
+
+def split_page(rows: Sequence[T], limit: int) -> Tuple[list[T], Optional[str]]:
+    """Trim the look-ahead row and build the cursor for the next page, if any."""
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    last = page[-1]
+    return page, encode_cursor(last.created_at, last.id)
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
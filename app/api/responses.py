@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+from typing import Any, Iterable, Optional, Type
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        # Same as pydantic's JSON mode, so money never goes through float.
+        return str(value)
+    if isinstance(value, uuid.UUID):
+        # asyncpg returns its own UUID subclass, which orjson does not accept.
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson.
+
+    UUIDs, datetimes (UTC as ``Z``), enums and decimals come out exactly as
+    pydantic's JSON mode writes them.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_UTC_Z)
+
+
+class RowRenderer:
+    """Render loaded ORM rows as a JSON list shaped like ``schema``.
+
+    Rows from the database were validated on the way in, so this skips
+    re-validating them (and re-parsing nested JSONB such as an application's
+    public profile). Column values are read straight from the instance
+    ``__dict__``, bypassing instrumented attribute access, with ``getattr``
+    as the fallback for anything not loaded.
+    """
+
+    def __init__(self, schema: Type[BaseModel]) -> None:
+        self.fields = tuple(schema.model_fields)
+
+    def to_dicts(self, rows: Iterable[Any]) -> list[dict[str, Any]]:
+        fields = self.fields
+        items = []
+        for row in rows:
+            loaded = row.__dict__
+            items.append(
+                {
+                    field: loaded[field] if field in loaded else getattr(row, field)
+                    for field in fields
+                }
+            )
+        return items
+
+    def dumps(self, rows: Iterable[Any]) -> bytes:
+        return orjson.dumps(self.to_dicts(rows), default=_orjson_default, option=orjson.OPT_UTC_Z)
+
+    def render(self, rows: Iterable[Any], response: Optional[Response] = None) -> ORJSONResponse:
+        """Build the response, keeping headers already set on ``response``."""
+        rendered = ORJSONResponse(self.to_dicts(rows))
+        if response is not None:
+            rendered.headers.raw.extend(response.headers.raw)
+        return rendered
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Request, Response, status
+
+from app.api.caching import etag_matches
+from app.auth.keys import get_jwt_keyset
+from app.config import get_settings
+
+router = APIRouter(prefix="/.well-known", tags=["auth"])
+
+settings = get_settings()
+JWKS_MAX_AGE_SECONDS = settings.JWKS_MAX_AGE_SECONDS
+
+
+@router.get("/jwks.json")
+async def jwks(request: Request) -> Response:
+    """Public keys for validating our JWTs; rendered once when keys load."""
+    keyset = get_jwt_keyset()
+    headers = {
+        "Cache-Control": (
+            f"public, max-age={JWKS_MAX_AGE_SECONDS}, "
+            f"stale-while-revalidate={JWKS_MAX_AGE_SECONDS}"
+        ),
+        "ETag": keyset.jwks_etag,
+    }
+    if etag_matches(request, keyset.jwks_etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(keyset.jwks_json, media_type="application/jwk-set+json", headers=headers)
@@ -1,17 +1,36 @@
 from datetime import datetime, timezone
+import asyncio
 import base64
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from fastapi import HTTPException, Request
-from typing import Dict
-import jwt
+from typing import Dict, Optional
 from datetime import timedelta
 
 from ..config import get_settings
+from ..services.cache import TTLCache
+from .base58 import PUBKEY_LENGTH, b58decode
+from .keys import get_jwt_keyset
+
+# Imported once here; the app can still start without pynacl for other routes.
+try:
+    from nacl.exceptions import BadSignatureError
+    from nacl.signing import VerifyKey
+except Exception:  # pragma: no cover - depends on optional dependency
+    BadSignatureError = None  # type: ignore[assignment,misc]
+    VerifyKey = None  # type: ignore[assignment,misc]
 
 settings = get_settings()
 
+# Signature verification
+AUTH_VERIFY_CONCURRENCY = settings.AUTH_VERIFY_CONCURRENCY
+AUTH_VERIFY_PROCESSES = settings.AUTH_VERIFY_PROCESSES
+AUTH_VERIFY_BATCH_PROCESS_THRESHOLD = settings.AUTH_VERIFY_BATCH_PROCESS_THRESHOLD
+AUTH_VERIFY_KEY_CACHE_SIZE = 4096
+
 # JWT config
-JWT_SECRET = settings.JWT_SECRET
-JWT_ALG = settings.JWT_ALG
 JWT_TTL_SECONDS = settings.JWT_TTL_SECONDS
 JWT_ISSUER = settings.JWT_ISSUER
 JWT_AUDIENCE = settings.JWT_AUDIENCE
@@ -24,6 +43,12 @@ JWT_COOKIE_SAMESITE = settings.JWT_COOKIE_SAMESITE
 JWT_COOKIE_PATH = settings.JWT_COOKIE_PATH
 JWT_COOKIE_PARTITIONED = settings.JWT_COOKIE_PARTITIONED
 
+# token sha256 -> verified claims
+_jwt_cache: TTLCache[bytes, Dict[str, str]] = TTLCache(
+    maxsize=settings.JWT_DECODE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.JWT_DECODE_CACHE_TTL_SECONDS,
+)
+
 def now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
@@ -34,23 +59,6 @@ def format_ts(dt: datetime) -> str:
     )
 
 
-_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
-_B58_MAP = {c: i for i, c in enumerate(_B58_ALPHABET)}
-
-
-def b58_decode(s: str) -> bytes:
-    n = 0
-    for ch in s:
-        if ch not in _B58_MAP:
-            raise ValueError("invalid base58 character")
-        n = n * 58 + _B58_MAP[ch]
-    # Convert big integer to bytes
-    full = n.to_bytes((n.bit_length() + 7) // 8, byteorder="big") or b"\x00"
-    # Add leading zero bytes for each leading '1'
-    leading_zeros = len(s) - len(s.lstrip("1"))
-    return b"\x00" * leading_zeros + full
-
-
 def build_message(domain: str, wallet: str, nonce: str, issued: datetime, expires: datetime, purpose: str) -> str:
     return (
         f"Sign in to {domain}\n"
@@ -61,46 +69,171 @@ def build_message(domain: str, wallet: str, nonce: str, issued: datetime, expire
         f"Purpose: {purpose}"
     )
 
-def verify_signature_solana_base58_pubkey_message_signature(pubkey_b58: str, message: str, signature_b64_or_hex: str, encoding: str = "base64") -> bool:
+def decode_wallet_pubkey(pubkey_b58: str) -> bytes:
     try:
-        pubkey_bytes = b58_decode(pubkey_b58)
-    except Exception:
+        pubkey_bytes = b58decode(pubkey_b58)
+    except ValueError:
         raise HTTPException(status_code=400, detail="invalid wallet format: not base58")
 
-    if len(pubkey_bytes) != 32:
+    if len(pubkey_bytes) != PUBKEY_LENGTH:
         raise HTTPException(status_code=400, detail="invalid wallet length: expected 32 bytes")
+    return pubkey_bytes
+
 
+def decode_signature(signature_b64_or_hex: str, encoding: str = "base64") -> bytes:
     if encoding.lower() == "base64":
         try:
-            sig_bytes = base64.b64decode(signature_b64_or_hex, validate=True)
+            return base64.b64decode(signature_b64_or_hex, validate=True)
         except Exception:
             raise HTTPException(status_code=400, detail="invalid base64 signature")
     elif encoding.lower() == "hex":
         try:
-            sig_bytes = bytes.fromhex(signature_b64_or_hex)
+            return bytes.fromhex(signature_b64_or_hex)
         except Exception:
             raise HTTPException(status_code=400, detail="invalid hex signature")
     else:
         raise HTTPException(status_code=400, detail="unsupported signature encoding")
 
-    # Defer import so the app can start without the dependency for other routes
-    try:
-        from nacl.signing import VerifyKey
-        from nacl.exceptions import BadSignatureError
-    except Exception as e:
+
+def require_signature_backend() -> None:
+    if VerifyKey is None:
         raise HTTPException(
             status_code=500,
             detail="signature verification unavailable: install 'pynacl'",
-        ) from e
+        )
+
 
+@lru_cache(maxsize=AUTH_VERIFY_KEY_CACHE_SIZE)
+def _load_verify_key(pubkey_b58: str) -> "VerifyKey":
+    return VerifyKey(decode_wallet_pubkey(pubkey_b58))
+
+
+def load_verify_key(pubkey_b58: str) -> "VerifyKey":
+    """Decoded and validated ``VerifyKey`` for a wallet, from a small LRU.
+
+    The same wallets sign in repeatedly, so this skips base58 decoding and key
+    construction on the hot path. Invalid wallets raise and are not cached.
+    """
+    require_signature_backend()
+    return _load_verify_key(pubkey_b58)
+
+
+def _verify_ed25519(key: "VerifyKey", message_bytes: bytes, sig_bytes: bytes) -> bool:
     try:
-        vk = VerifyKey(pubkey_bytes)
-        vk.verify(message.encode("utf-8"), sig_bytes)
+        key.verify(message_bytes, sig_bytes)
         return True
-    except BadSignatureError:
+    except (BadSignatureError, ValueError):
+        # ValueError covers signatures of the wrong length.
         return False
 
 
+def verify_signature_solana_base58_pubkey_message_signature(pubkey_b58: str, message: str, signature_b64_or_hex: str, encoding: str = "base64") -> bool:
+    key = load_verify_key(pubkey_b58)
+    sig_bytes = decode_signature(signature_b64_or_hex, encoding)
+    return _verify_ed25519(key, message.encode("utf-8"), sig_bytes)
+
+
+_verify_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_verify_executor() -> ThreadPoolExecutor:
+    global _verify_executor
+    if _verify_executor is None:
+        _verify_executor = ThreadPoolExecutor(
+            max_workers=AUTH_VERIFY_CONCURRENCY, thread_name_prefix="ed25519-verify"
+        )
+    return _verify_executor
+
+
+def shutdown_verify_executor() -> None:
+    global _verify_executor, _verify_process_pool
+    if _verify_executor is not None:
+        _verify_executor.shutdown(wait=False, cancel_futures=True)
+        _verify_executor = None
+    if _verify_process_pool is not None:
+        _verify_process_pool.shutdown(wait=False, cancel_futures=True)
+        _verify_process_pool = None
+
+
+async def verify_signature_async(
+    pubkey_b58: str, message: str, signature_b64_or_hex: str, encoding: str = "base64"
+) -> bool:
+    """Async variant that runs the Ed25519 check on a dedicated, bounded executor.
+
+    libsodium releases the GIL, so verification scales with the executor size
+    and never occupies Starlette's shared threadpool or the event loop.
+    """
+    key = load_verify_key(pubkey_b58)
+    sig_bytes = decode_signature(signature_b64_or_hex, encoding)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_verify_executor(), _verify_ed25519, key, message.encode("utf-8"), sig_bytes
+    )
+
+
+def _verify_ed25519_chunk(jobs: list[tuple[bytes, bytes, bytes]]) -> list[bool]:
+    """Verify (pubkey, message, signature) triples, building each VerifyKey once.
+
+    Module-level so it can be shipped to process-pool workers.
+    """
+    keys: Dict[bytes, "VerifyKey"] = {}
+    results = []
+    for pubkey_bytes, message_bytes, sig_bytes in jobs:
+        key = keys.get(pubkey_bytes)
+        if key is None:
+            key = keys[pubkey_bytes] = VerifyKey(pubkey_bytes)
+        try:
+            key.verify(message_bytes, sig_bytes)
+            results.append(True)
+        except (BadSignatureError, ValueError):
+            results.append(False)
+    return results
+
+
+_verify_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_verify_process_pool() -> ProcessPoolExecutor:
+    global _verify_process_pool
+    if _verify_process_pool is None:
+        _verify_process_pool = ProcessPoolExecutor(
+            max_workers=AUTH_VERIFY_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _verify_process_pool
+
+
+async def verify_ed25519_batch(jobs: list[tuple[bytes, bytes, bytes]]) -> list[bool]:
+    """Verify many signatures, spreading large batches across a process pool.
+
+    Jobs are grouped by public key so each worker constructs a given
+    ``VerifyKey`` once. Batches below ``AUTH_VERIFY_BATCH_PROCESS_THRESHOLD``
+    stay on the thread executor, where there is no pickling overhead.
+    """
+    if not jobs:
+        return []
+    loop = asyncio.get_running_loop()
+    if len(jobs) < AUTH_VERIFY_BATCH_PROCESS_THRESHOLD:
+        return await loop.run_in_executor(_get_verify_executor(), _verify_ed25519_chunk, jobs)
+
+    order = sorted(range(len(jobs)), key=lambda i: jobs[i][0])
+    chunk_size = -(-len(jobs) // AUTH_VERIFY_PROCESSES)
+    chunks = [order[i:i + chunk_size] for i in range(0, len(order), chunk_size)]
+    pool = _get_verify_process_pool()
+    chunk_results = await asyncio.gather(
+        *(
+            loop.run_in_executor(pool, _verify_ed25519_chunk, [jobs[i] for i in chunk])
+            for chunk in chunks
+        )
+    )
+
+    results = [False] * len(jobs)
+    for chunk, chunk_result in zip(chunks, chunk_results):
+        for index, ok in zip(chunk, chunk_result):
+            results[index] = ok
+    return results
+
+
 ############## for JWT ###############
 
 def mint_jwt(wallet: str, nonce: str, purpose: str, domain: str) -> tuple[str, datetime]:
@@ -117,7 +250,7 @@ def mint_jwt(wallet: str, nonce: str, purpose: str, domain: str) -> tuple[str, d
     }
     if JWT_AUDIENCE:
         payload["aud"] = JWT_AUDIENCE
-    token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALG)
+    token = get_jwt_keyset().sign(payload)
     return token, exp
 
 
@@ -133,19 +266,32 @@ def get_token_from_request(request: Request) -> str | None:
 def decode_jwt(token: str) -> Dict[str, str]:
     verify_options = {"verify_aud": bool(JWT_AUDIENCE)}
     if JWT_AUDIENCE:
-        return jwt.decode(
+        return get_jwt_keyset().verify(
             token,
-            JWT_SECRET,
-            algorithms=[JWT_ALG],
             issuer=JWT_ISSUER,
             audience=JWT_AUDIENCE,
             options=verify_options,
         )
     else:
-        return jwt.decode(
+        return get_jwt_keyset().verify(
             token,
-            JWT_SECRET,
-            algorithms=[JWT_ALG],
             issuer=JWT_ISSUER,
             options=verify_options,
         )
+
+
+def decode_jwt_cached(token: str) -> Dict[str, str]:
+    """``decode_jwt`` behind a cache keyed on the token digest.
+
+    Entries never outlive the token's ``exp``, so an expired token is always
+    re-verified (and rejected) by ``decode_jwt``. Failures are not cached.
+    """
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = _jwt_cache.get(digest)
+    if payload is not None:
+        return payload
+    payload = decode_jwt(token)
+    exp = payload.get("exp")
+    if exp is not None:
+        _jwt_cache.set(digest, payload, ttl_seconds=float(exp) - now_utc().timestamp())
+    return payload
@@ -0,0 +1,62 @@
+"""Base58 (Bitcoin/Solana alphabet) codec tuned for keys and signatures.
+
+Validation and digit mapping are done with ``bytes.translate`` tables in C, so
+the only Python-level loop left is the big-integer accumulation itself.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+ALPHABET = b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+# character -> digit value, and digit value -> character
+_DECODE_TABLE = bytes.maketrans(ALPHABET, bytes(range(58)))
+_ENCODE_TABLE = bytes.maketrans(bytes(range(58)), ALPHABET)
+
+# 58**10 < 2**64, so ten digits at a time stay machine-word sized while encoding.
+_CHUNK_DIGITS = 10
+_CHUNK_BASE = 58**_CHUNK_DIGITS
+
+PUBKEY_LENGTH = 32
+SIGNATURE_LENGTH = 64
+
+
+def b58decode(value: str, expected_length: Optional[int] = None) -> bytes:
+    """Decode a base58 string, optionally requiring an exact decoded length."""
+    try:
+        raw = value.encode("ascii")
+    except UnicodeEncodeError as exc:
+        raise ValueError("invalid base58 character") from exc
+    if raw.translate(None, ALPHABET):
+        raise ValueError("invalid base58 character")
+
+    n = 0
+    for digit in raw.translate(_DECODE_TABLE):
+        n = n * 58 + digit
+
+    leading_zeros = len(raw) - len(raw.lstrip(b"1"))
+    if expected_length is not None:
+        body_length = expected_length - leading_zeros
+        if (n.bit_length() + 7) // 8 != body_length:
+            raise ValueError(f"expected {expected_length} bytes")
+        return b"\x00" * leading_zeros + n.to_bytes(body_length, "big")
+
+    body = n.to_bytes((n.bit_length() + 7) // 8, "big") if n else b""
+    return b"\x00" * leading_zeros + body
+
+
+def b58encode(data: bytes) -> str:
+    n = int.from_bytes(data, "big")
+    digits = bytearray()
+    while n:
+        n, chunk = divmod(n, _CHUNK_BASE)
+        for _ in range(_CHUNK_DIGITS):
+            chunk, digit = divmod(chunk, 58)
+            digits.append(digit)
+    # Chunking pads the most significant end with zero digits; drop them.
+    while digits and digits[-1] == 0:
+        digits.pop()
+    digits.reverse()
+
+    leading_zeros = len(data) - len(data.lstrip(b"\x00"))
+    return "1" * leading_zeros + digits.translate(_ENCODE_TABLE).decode("ascii")
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.auth import now_utc
+from app.config import get_settings
+from app.db import SessionLocal
+from app.models import AuthChallenge
+from app.schemas.auth import ChallengeRecord
+
+
+class ChallengeStore(ABC):
+    """Holds issued sign-in challenges until they are consumed or expire."""
+
+    @abstractmethod
+    async def put(self, record: ChallengeRecord) -> None:
+        """Store a newly issued challenge.
+
+        Never rejects: issuing needs no proof of wallet ownership, so a limit
+        keyed on the wallet would let anyone lock that wallet out. Once a
+        wallet holds ``max_per_wallet`` challenges its oldest one is evicted
+        instead.
+        """
+
+    @abstractmethod
+    async def consume(self, nonce: str) -> Optional[ChallengeRecord]:
+        """Atomically remove and return the challenge for ``nonce``.
+
+        Expired records may still be returned; callers check ``expires_at``.
+        """
+
+    def outstanding(self) -> Optional[int]:
+        """Challenges currently held, if the backend can tell cheaply."""
+        return None
+
+
+# Upper bound on expired entries dropped by a single issue/consume call.
+_EXPIRE_BUDGET = 64
+
+
+class InMemoryChallengeStore(ChallengeStore):
+    """Process-local store; only correct with a single API worker.
+
+    Expiry uses a timing wheel with one-second slots: each challenge sits in
+    the set for the second it expires in, and a min-heap orders the slots.
+    Every operation drops at most a fixed number of expired entries, so
+    there is no sweeper thread, no full scan and no latency spike when a
+    burst of challenges expires together. Consuming or evicting a challenge
+    removes it from its slot directly, leaving nothing stale behind.
+
+    The store holds at most ``max_outstanding`` challenges and
+    ``max_per_wallet`` per wallet; past either bound the oldest challenge
+    (overall, or for that wallet) is evicted in O(1).
+    """
+
+    def __init__(self, max_outstanding: int = 100_000, max_per_wallet: int = 5) -> None:
+        if max_outstanding < 1:
+            raise ValueError("max_outstanding must be at least 1")
+        if max_per_wallet < 1:
+            raise ValueError("max_per_wallet must be at least 1")
+        # Insertion-ordered, so the first entry is the oldest.
+        self._challenges: "OrderedDict[str, ChallengeRecord]" = OrderedDict()
+        self._per_wallet: Dict[str, "OrderedDict[str, None]"] = {}
+        # Expiry second -> nonces expiring in it; the heap holds each second once.
+        self._slots: Dict[int, Set[str]] = {}
+        self._slot_heap: List[int] = []
+        self._max_outstanding = max_outstanding
+        self._max_per_wallet = max_per_wallet
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._challenges)
+
+    def outstanding(self) -> Optional[int]:
+        return len(self._challenges)
+
+    @staticmethod
+    def _slot_of(record: ChallengeRecord) -> int:
+        return math.ceil(record.expires_at.timestamp())
+
+    def _forget(self, record: ChallengeRecord) -> None:
+        nonces = self._per_wallet.get(record.wallet)
+        if nonces is not None:
+            nonces.pop(record.nonce, None)
+            if not nonces:
+                del self._per_wallet[record.wallet]
+        # Emptied slots stay until their second passes, so each second is
+        # pushed onto the heap at most once.
+        slot = self._slots.get(self._slot_of(record))
+        if slot is not None:
+            slot.discard(record.nonce)
+
+    def _expire(self, now: float, budget: int = _EXPIRE_BUDGET) -> None:
+        heap = self._slot_heap
+        while heap and heap[0] <= now:
+            slot = self._slots[heap[0]]
+            while slot:
+                if budget <= 0:
+                    return
+                budget -= 1
+                self._forget(self._challenges.pop(slot.pop()))
+            del self._slots[heapq.heappop(heap)]
+
+    def put_nowait(self, record: ChallengeRecord) -> None:
+        with self._lock:
+            self._expire(time.time())
+            previous = self._challenges.pop(record.nonce, None)
+            if previous is not None:
+                self._forget(previous)
+            wallet_nonces = self._per_wallet.get(record.wallet)
+            if wallet_nonces is not None and len(wallet_nonces) >= self._max_per_wallet:
+                oldest, _ = wallet_nonces.popitem(last=False)
+                self._forget(self._challenges.pop(oldest))
+            if len(self._challenges) >= self._max_outstanding:
+                _, oldest_record = self._challenges.popitem(last=False)
+                self._forget(oldest_record)
+
+            self._challenges[record.nonce] = record
+            self._per_wallet.setdefault(record.wallet, OrderedDict())[record.nonce] = None
+            second = self._slot_of(record)
+            slot = self._slots.get(second)
+            if slot is None:
+                slot = self._slots[second] = set()
+                heapq.heappush(self._slot_heap, second)
+            slot.add(record.nonce)
+
+    def consume_nowait(self, nonce: str) -> Optional[ChallengeRecord]:
+        with self._lock:
+            self._expire(time.time())
+            record = self._challenges.pop(nonce, None)
+            if record is not None:
+                self._forget(record)
+            return record
+
+    async def put(self, record: ChallengeRecord) -> None:
+        self.put_nowait(record)
+
+    async def consume(self, nonce: str) -> Optional[ChallengeRecord]:
+        return self.consume_nowait(nonce)
+
+
+class PostgresChallengeStore(ChallengeStore):
+    """Store backed by the UNLOGGED ``auth_challenges`` table.
+
+    Any worker can consume a challenge issued by any other; ``DELETE ..
+    RETURNING`` guarantees a nonce is handed out at most once. Like the
+    in-memory store it keeps the newest ``max_per_wallet`` challenges per
+    wallet; the table as a whole is bounded by expiry pruning rather than a
+    global cap.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        prune_interval_seconds: float = 60,
+        max_per_wallet: int = 5,
+    ) -> None:
+        self._session_factory = session_factory
+        self._prune_interval = prune_interval_seconds
+        self._max_per_wallet = max_per_wallet
+        self._last_prune = 0.0
+
+    async def put(self, record: ChallengeRecord) -> None:
+        async with self._session_factory() as session:
+            await session.execute(
+                insert(AuthChallenge).values(
+                    nonce=record.nonce,
+                    wallet=record.wallet,
+                    issued_at=record.issued_at,
+                    expires_at=record.expires_at,
+                    purpose=record.purpose,
+                    domain=record.domain,
+                    message=record.message,
+                )
+            )
+            table = AuthChallenge.__table__
+            evicted = (
+                select(table.c.nonce)
+                .where(table.c.wallet == record.wallet)
+                .order_by(table.c.issued_at.desc(), table.c.nonce.desc())
+                .offset(self._max_per_wallet)
+                .scalar_subquery()
+            )
+            await session.execute(delete(table).where(table.c.nonce.in_(evicted)))
+            if time.monotonic() - self._last_prune >= self._prune_interval:
+                self._last_prune = time.monotonic()
+                await session.execute(delete(table).where(table.c.expires_at < now_utc()))
+            await session.commit()
+
+    async def consume(self, nonce: str) -> Optional[ChallengeRecord]:
+        table = AuthChallenge.__table__
+        async with self._session_factory() as session:
+            result = await session.execute(
+                delete(table).where(table.c.nonce == nonce).returning(*table.c)
+            )
+            row = result.mappings().one_or_none()
+            await session.commit()
+        if row is None:
+            return None
+        return ChallengeRecord(**row)
+
+
+_challenge_store: Optional[ChallengeStore] = None
+
+
+def get_challenge_store() -> ChallengeStore:
+    global _challenge_store
+    if _challenge_store is None:
+        settings = get_settings()
+        backend = settings.AUTH_CHALLENGE_STORE
+        if backend == "postgres":
+            _challenge_store = PostgresChallengeStore(
+                SessionLocal, max_per_wallet=settings.AUTH_CHALLENGE_MAX_PER_WALLET
+            )
+        elif backend == "memory":
+            _challenge_store = InMemoryChallengeStore(
+                max_outstanding=settings.AUTH_CHALLENGE_MAX_OUTSTANDING,
+                max_per_wallet=settings.AUTH_CHALLENGE_MAX_PER_WALLET,
+            )
+        else:
+            raise ValueError(f"unknown AUTH_CHALLENGE_STORE backend: {backend}")
+    return _challenge_store
@@ -0,0 +1,185 @@
+"""Keyset used to sign and verify our JWTs.
+
+Asymmetric keys live in ``JWT_KEYS_DIR``, one PEM file per key named
+``<kid>.pem``. A file holding a private key can sign; a file holding only a
+public key verifies tokens but never signs them. Ed25519 keys sign with EdDSA
+and P-256 keys with ES256, and every key is published at
+``/.well-known/jwks.json`` so other services can validate tokens locally.
+
+Rotating without downtime:
+
+1. Add the new ``<kid>.pem`` and roll the deployment. The key is published but
+   not used; wait ``JWKS_MAX_AGE_SECONDS`` so downstream JWKS caches see it.
+2. Set ``JWT_ACTIVE_KID`` to the new kid and roll again.
+3. After ``JWT_TTL_SECONDS`` no valid token references the old kid; delete
+   its file and roll a final time.
+
+Without ``JWT_KEYS_DIR`` tokens are signed with ``JWT_SECRET``/``JWT_ALG``
+as before. Once a keyset is loaded, tokens without a ``kid`` header are
+rejected unless ``JWT_ACCEPT_HS256`` is set for the migration window; that
+opt-in refuses to start with the default ``JWT_SECRET``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import jwt
+
+from ..config import Settings, get_settings
+
+# Only needed when JWT_KEYS_DIR is configured.
+try:
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+    from cryptography.hazmat.primitives.serialization import (
+        load_pem_private_key,
+        load_pem_public_key,
+    )
+except Exception:  # pragma: no cover - depends on optional dependency
+    ec = ed25519 = None  # type: ignore[assignment]
+    load_pem_private_key = load_pem_public_key = None  # type: ignore[assignment]
+
+
+@dataclass(frozen=True)
+class JwtKey:
+    kid: str
+    algorithm: str
+    public_key: Any
+    private_key: Any = None
+
+    def public_jwk(self) -> Dict[str, str]:
+        algorithm = jwt.get_algorithm_by_name(self.algorithm)
+        jwk = algorithm.to_jwk(self.public_key, as_dict=True)
+        jwk.update(kid=self.kid, alg=self.algorithm, use="sig")
+        return jwk
+
+
+def _algorithm_for(public_key: Any) -> str:
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    if isinstance(public_key, ec.EllipticCurvePublicKey) and isinstance(
+        public_key.curve, ec.SECP256R1
+    ):
+        return "ES256"
+    raise ValueError(f"unsupported JWT key type: {type(public_key).__name__}")
+
+
+def load_key_file(path: Path) -> JwtKey:
+    if load_pem_private_key is None:
+        raise RuntimeError("cryptography not installed; install PyJWT[crypto]")
+    data = path.read_bytes()
+    if b"PRIVATE KEY" in data:
+        private_key = load_pem_private_key(data, password=None)
+        public_key = private_key.public_key()
+    else:
+        private_key = None
+        public_key = load_pem_public_key(data)
+    return JwtKey(
+        kid=path.stem,
+        algorithm=_algorithm_for(public_key),
+        public_key=public_key,
+        private_key=private_key,
+    )
+
+
+class JwtKeyset:
+    """Immutable, kid-indexed set of signing and verification keys.
+
+    The JWKS document and its ETag are rendered once on construction.
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[JwtKey] = (),
+        active_kid: Optional[str] = None,
+        hmac_secret: Optional[str] = None,
+        hmac_algorithm: str = "HS256",
+    ) -> None:
+        self._keys: Dict[str, JwtKey] = {key.kid: key for key in keys}
+        if active_kid is None:
+            signers = [key for key in self._keys.values() if key.private_key is not None]
+            if len(signers) > 1:
+                raise ValueError("JWT_ACTIVE_KID is required when several signing keys exist")
+            active_kid = signers[0].kid if signers else None
+        self.active: Optional[JwtKey] = None
+        if active_kid is not None:
+            active = self._keys.get(active_kid)
+            if active is None or active.private_key is None:
+                raise ValueError(f"no private key for JWT_ACTIVE_KID {active_kid!r}")
+            self.active = active
+        if self.active is None and hmac_secret is None:
+            raise ValueError("JWT keyset has no signing key")
+        self._hmac_secret = hmac_secret
+        self._hmac_algorithm = hmac_algorithm
+
+        document = {"keys": [key.public_jwk() for key in self._keys.values()]}
+        self.jwks_json = json.dumps(document, separators=(",", ":"), sort_keys=True).encode()
+        self.jwks_etag = f'"{hashlib.sha256(self.jwks_json).hexdigest()}"'
+
+    @classmethod
+    def from_directory(
+        cls,
+        path: str,
+        active_kid: Optional[str] = None,
+        hmac_secret: Optional[str] = None,
+        hmac_algorithm: str = "HS256",
+    ) -> "JwtKeyset":
+        keys = [load_key_file(file) for file in sorted(Path(path).glob("*.pem"))]
+        if not keys:
+            raise ValueError(f"no *.pem keys found in {path}")
+        return cls(keys, active_kid, hmac_secret, hmac_algorithm)
+
+    def sign(self, payload: Dict[str, Any]) -> str:
+        if self.active is None:
+            return jwt.encode(payload, self._hmac_secret, algorithm=self._hmac_algorithm)
+        return jwt.encode(
+            payload,
+            self.active.private_key,
+            algorithm=self.active.algorithm,
+            headers={"kid": self.active.kid},
+        )
+
+    def verify(self, token: str, **decode_kwargs: Any) -> Dict[str, Any]:
+        """Decode ``token`` with the key its ``kid`` names.
+
+        Each key only accepts its own algorithm, so a token cannot pick a
+        weaker one (or HMAC with a public key) through its header.
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            if self._hmac_secret is None:
+                raise jwt.InvalidTokenError("token has no kid")
+            return jwt.decode(
+                token, self._hmac_secret, algorithms=[self._hmac_algorithm], **decode_kwargs
+            )
+        key = self._keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"unknown kid {kid!r}")
+        return jwt.decode(token, key.public_key, algorithms=[key.algorithm], **decode_kwargs)
+
+
+_jwt_keyset: Optional[JwtKeyset] = None
+
+
+def get_jwt_keyset() -> JwtKeyset:
+    global _jwt_keyset
+    if _jwt_keyset is None:
+        settings = get_settings()
+        if settings.JWT_KEYS_DIR:
+            hmac_secret = None
+            if settings.JWT_ACCEPT_HS256:
+                if settings.JWT_SECRET == Settings.JWT_SECRET:
+                    raise ValueError("JWT_ACCEPT_HS256 requires JWT_SECRET to be changed")
+                hmac_secret = settings.JWT_SECRET
+            _jwt_keyset = JwtKeyset.from_directory(
+                settings.JWT_KEYS_DIR,
+                active_kid=settings.JWT_ACTIVE_KID,
+                hmac_secret=hmac_secret,
+                hmac_algorithm=settings.JWT_ALG,
+            )
+        else:
+            _jwt_keyset = JwtKeyset(hmac_secret=settings.JWT_SECRET, hmac_algorithm=settings.JWT_ALG)
+    return _jwt_keyset
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from collections import defaultdict
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict
 
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import get_settings
 
@@ -13,13 +20,151 @@ class Base(DeclarativeBase):
     """Declarative base for SQLAlchemy models."""
 
 
+@dataclass
+class PoolAcquireStats:
+    """Running totals for connection checkouts from the pool."""
+
+    count: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def record(self, waited: float) -> None:
+        self.count += 1
+        self.wait_seconds_total += waited
+        if waited > self.wait_seconds_max:
+            self.wait_seconds_max = waited
+
+
+# Keyed by pool logging name ("primary" / "replica").
+_acquire_stats: Dict[str, PoolAcquireStats] = defaultdict(PoolAcquireStats)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that times how long each checkout waits for a connection.
+
+    The time includes opening a new connection when the pool grows, which is
+    what a request actually waits for. Stats live at module level so they
+    survive ``engine.dispose()`` recreating the pool.
+    """
+
+    def _do_get(self):
+        stats = _acquire_stats[self._orig_logging_name]
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            stats.timeouts += 1
+            raise
+        finally:
+            stats.record(time.perf_counter() - started)
+
+
+def _build_engine(settings, database_url: str, name: str):
+    url = make_url(database_url)
+    connect_args = {}
+    if url.get_driver_name() == "asyncpg":
+        # asyncpg's own prepared statement cache and SQLAlchemy's on top of it;
+        # set to 0 behind a transaction-pooling PgBouncer.
+        connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+        url = url.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+        )
+    return create_async_engine(
+        url,
+        echo=False,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_logging_name=name,
+        connect_args=connect_args,
+    )
+
+
 _settings = get_settings()
-_engine = create_async_engine(_settings.DATABASE_URL, echo=False, future=True)
+_engine = _build_engine(_settings, _settings.DATABASE_URL, "primary")
 SessionLocal = async_sessionmaker(_engine, expire_on_commit=False, class_=AsyncSession)
 
+# Optional replica for read-only handlers; falls back to the primary.
+_read_engine = (
+    _build_engine(_settings, _settings.DATABASE_READ_URL, "replica")
+    if _settings.DATABASE_READ_URL
+    else None
+)
+ReadSessionLocal = (
+    async_sessionmaker(_read_engine, expire_on_commit=False, class_=AsyncSession)
+    if _read_engine is not None
+    else SessionLocal
+)
+
 
 @asynccontextmanager
 async def get_session() -> AsyncIterator[AsyncSession]:
     """Provide a transactional scope around a series of operations."""
     async with SessionLocal() as session:
         yield session
+
+
+@asynccontextmanager
+async def get_read_session() -> AsyncIterator[AsyncSession]:
+    """Session on the read replica (or the primary if none is configured).
+
+    Replicas lag the primary; use ``get_session`` when the caller must see
+    its own recent writes.
+    """
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+def has_read_replica() -> bool:
+    return _read_engine is not None
+
+
+async def warm_up_pool(connections: int = _settings.DB_POOL_WARMUP) -> None:
+    """Open ``connections`` pooled connections concurrently, then check them in.
+
+    Moves connection setup cost from the first requests after a deploy to
+    startup. Both the primary and the replica pool are warmed. Raises the
+    first connection error, if any.
+    """
+    count = min(connections, _settings.DB_POOL_SIZE)
+    engines = [_engine] if _read_engine is None else [_engine, _read_engine]
+    pending = [engine.connect() for engine in engines for _ in range(count)]
+    results = await asyncio.gather(*(conn.start() for conn in pending), return_exceptions=True)
+    await asyncio.gather(*(conn.close() for conn in pending if conn.sync_connection is not None))
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+async def dispose_engine() -> None:
+    await _engine.dispose()
+    if _read_engine is not None:
+        await _read_engine.dispose()
+
+
+def _engine_pool_stats(engine, name: str) -> Dict[str, float]:
+    pool = engine.pool
+    stats = _acquire_stats[name]
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": _settings.DB_MAX_OVERFLOW,
+        "acquire_count": stats.count,
+        "acquire_timeouts": stats.timeouts,
+        "acquire_wait_seconds_total": round(stats.wait_seconds_total, 6),
+        "acquire_wait_seconds_max": round(stats.wait_seconds_max, 6),
+    }
+
+
+def get_pool_stats() -> Dict[str, Dict[str, float]]:
+    """Pool gauges per engine: ``primary`` and, if configured, ``replica``."""
+    stats = {"primary": _engine_pool_stats(_engine, "primary")}
+    if _read_engine is not None:
+        stats["replica"] = _engine_pool_stats(_read_engine, "replica")
+    return stats
@@ -2,11 +2,54 @@ from __future__ import annotations
 
 from typing import AsyncGenerator
 
+from fastapi import HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_session
+from app.auth.auth import decode_jwt_cached, get_token_from_request
+from app.db import get_read_session, get_session
+from app.middleware import (
+    READ_PRIMARY_COOKIE,
+    READ_PRIMARY_HEADER,
+    READ_PRIMARY_HEADER_VALUES,
+)
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     async with get_session() as session:
         yield session
+
+
+def reads_from_primary(request: Request) -> bool:
+    """True while the client is inside its read-your-writes window.
+
+    ``X-Read-Primary`` opts in with ``1``, ``true`` or ``yes``; ``0``,
+    ``false`` or any other value leaves reads on the replica.
+    """
+    if READ_PRIMARY_COOKIE in request.cookies:
+        return True
+    header = request.headers.get(READ_PRIMARY_HEADER, "")
+    return header.strip().lower() in READ_PRIMARY_HEADER_VALUES
+
+
+async def get_read_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only handlers: the replica, unless the client just wrote."""
+    session_scope = get_session if reads_from_primary(request) else get_read_session
+    async with session_scope() as session:
+        yield session
+
+
+async def get_current_wallet(request: Request) -> str:
+    """Wallet (``sub``) of the bearer or cookie token; 401 if absent or invalid."""
+    token = get_token_from_request(request)
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="missing token")
+    try:
+        payload = decode_jwt_cached(token)
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid token"
+        ) from exc
+    wallet = payload.get("sub")
+    if not wallet:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid token")
+    return wallet
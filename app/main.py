@@ -5,11 +5,29 @@ import logging
 from fastapi import FastAPI, Request, Response
 from starlette.middleware.cors import CORSMiddleware
 
-from app.api import applications, auth, bounties, webhooks
-from app.db import get_session
+from app.api import applications, auth, bounties, metrics, webhooks, well_known
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.api.responses import ORJSONResponse
+from app.auth.auth import shutdown_verify_executor
+from app.auth.keys import get_jwt_keyset
+from app.config import get_settings
+from app.db import (
+    dispose_engine,
+    get_pool_stats,
+    get_session,
+    has_read_replica,
+    warm_up_pool,
+)
+from app.middleware import HttpMetricsMiddleware, ReadYourWritesMiddleware, SqlStatsMiddleware
 from app.services.bootstrap import seed_poc_data
+from app.services.bounty_board import start_bounty_board_listener, stop_bounty_board_listener
+from app.services.storage import close_private_storage_service
 
-app = FastAPI(title="Headhunt Bounty API", version="0.1.0")
+app = FastAPI(
+    title="Headhunt Bounty API",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +44,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
+app.add_middleware(SqlStatsMiddleware)
+app.add_middleware(HttpMetricsMiddleware)
+
+if has_read_replica():
+    app.add_middleware(
+        ReadYourWritesMiddleware,
+        window_seconds=get_settings().READ_YOUR_WRITES_SECONDS,
+    )
 
 
 # Health endpoint
@@ -35,11 +62,32 @@ async def read_root() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/health/db")
+async def read_pool_stats() -> dict[str, dict[str, int | float]]:
+    return get_pool_stats()
+
+
 # Register routers
 app.include_router(auth.router)
 app.include_router(bounties.router)
 app.include_router(applications.router)
 app.include_router(webhooks.router)
+app.include_router(well_known.router)
+app.include_router(metrics.router)
+
+
+@app.on_event("startup")
+async def _load_jwt_keyset() -> None:
+    # Fail fast on a bad JWT_KEYS_DIR instead of on the first sign-in.
+    get_jwt_keyset()
+
+
+@app.on_event("startup")
+async def _warm_up_db_pool() -> None:
+    try:
+        await warm_up_pool()
+    except Exception as exc:  # noqa: BLE001 - the pool still connects lazily
+        logger.warning("Skipping DB pool warm-up due to error: %s", exc)
 
 
 @app.on_event("startup")
@@ -49,3 +97,28 @@ async def _bootstrap_seed_data() -> None:
             await seed_poc_data(session)
     except Exception as exc:  # noqa: BLE001 - best effort seed for POC
         logger.warning("Skipping seed bootstrap due to error: %s", exc)
+
+
+@app.on_event("startup")
+async def _listen_for_bounty_board_changes() -> None:
+    start_bounty_board_listener()
+
+
+@app.on_event("shutdown")
+async def _stop_bounty_board_listener() -> None:
+    await stop_bounty_board_listener()
+
+
+@app.on_event("shutdown")
+async def _shutdown_verify_executor() -> None:
+    shutdown_verify_executor()
+
+
+@app.on_event("shutdown")
+async def _close_storage_client() -> None:
+    await close_private_storage_service()
+
+
+@app.on_event("shutdown")
+async def _dispose_db_engine() -> None:
+    await dispose_engine()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.services.metrics import (
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_total,
+)
+from app.services.sql_stats import begin_request, current_request_stats, end_request
+
+settings = get_settings()
+
+# Either of these sends a request's reads to the primary instead of a replica.
+READ_PRIMARY_COOKIE = "read_primary"
+READ_PRIMARY_HEADER = "x-read-primary"
+READ_PRIMARY_HEADER_VALUES = frozenset({"1", "true", "yes"})  # compared lower-cased
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _read_primary_cookie(max_age: int) -> str:
+    parts = [f"{READ_PRIMARY_COOKIE}=1", f"Max-Age={max_age}", "Path=/", "HttpOnly"]
+    if settings.JWT_COOKIE_DOMAIN:
+        parts.append(f"Domain={settings.JWT_COOKIE_DOMAIN}")
+    parts.append(f"SameSite={settings.JWT_COOKIE_SAMESITE}")
+    if settings.JWT_COOKIE_SECURE:
+        parts.append("Secure")
+        if settings.JWT_COOKIE_PARTITIONED:
+            parts.append("Partitioned")
+    return "; ".join(parts)
+
+
+class ReadYourWritesMiddleware:
+    """Pin a client's reads to the primary for a short window after a write.
+
+    Successful non-GET responses set a short-lived ``read_primary`` cookie;
+    ``get_read_db_session`` sees it and skips the replica until it expires, so
+    replica lag never hides the client's own write.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: int) -> None:
+        self.app = app
+        self.cookie = _read_primary_cookie(window_seconds)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message).append("set-cookie", self.cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def route_path(scope: Scope) -> str:
+    """Route template for labelling (``/bounties/{bounty_id}``), not the raw path."""
+    route = scope.get("route")
+    return getattr(route, "path", "<unmatched>")
+
+
+def _shared_cacheable(headers: MutableHeaders) -> bool:
+    directives = {
+        directive.split("=", 1)[0].strip().lower()
+        for directive in headers.get("cache-control", "").split(",")
+    }
+    return "public" in directives or "s-maxage" in directives
+
+
+class SqlStatsMiddleware:
+    """Collect SQL stats per request and report them in ``Server-Timing``.
+
+    The header is written when the response starts, so a streamed body's
+    queries are only reflected in the per-route totals. Responses a shared
+    cache may store (the public bounty board) go out without it, so the CDN
+    never replays one request's timings to anonymous clients.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                stats = current_request_stats()
+                headers = MutableHeaders(scope=message)
+                if stats is not None and not _shared_cacheable(headers):
+                    headers.append("server-timing", stats.server_timing())
+            await send(message)
+
+        token = begin_request()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_request(token, route_path(scope))
+
+
+class HttpMetricsMiddleware:
+    """Request counts, status classes and latency per route template."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            route = route_path(scope)
+            method = scope["method"]
+            http_request_duration_seconds.observe(time.perf_counter() - started, method, route)
+            http_requests_total.inc(method, route, f"{status_code // 100}xx")
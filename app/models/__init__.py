@@ -1,6 +1,7 @@
 from .entities import (
     Account,
     AccountRole,
+    AuthChallenge,
     Application,
     ApplicationPrivateVersion,
     ApplicationStatus,
@@ -16,6 +17,7 @@ from .entities import (
 __all__ = [
     "Account",
     "AccountRole",
+    "AuthChallenge",
     "Application",
     "ApplicationPrivateVersion",
     "ApplicationStatus",
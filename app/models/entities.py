@@ -13,9 +13,12 @@ from sqlalchemy import (
     Index,
     Numeric,
     String,
+    Text,
     UniqueConstraint,
+    cast,
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.ext.mutable import MutableList
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -59,6 +62,8 @@ class EventEntity(str, enum.Enum):
     PAYOUT = "payout"
 
 
+BOUNTY_SEARCH_CONFIG = "english"
+
 class Account(Base):
     __tablename__ = "accounts"
 
@@ -111,6 +116,10 @@ class Bounty(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
     )
+    # Weighted title/company/skills/description document. The
+    # bounties_search_vector_update trigger from migration 0005 sets it on every
+    # insert and text change, so the app never writes it.
+    search_vector: Mapped[Optional[str]] = mapped_column(TSVECTOR, deferred=True)
 
     recruiter: Mapped[Account] = relationship(back_populates="bounties")
     applications: Mapped[List["Application"]] = relationship(
@@ -122,7 +131,44 @@ class Bounty(Base):
         Index("ix_bounty_company", "company"),
         Index("ix_bounty_region", "region"),
         Index("ix_bounty_employment_type", "employment_type"),
-    )
+        Index("ix_bounty_created_at_id", "created_at", "id"),
+        Index(
+            "ix_bounty_company_trgm",
+            "company",
+            postgresql_using="gin",
+            postgresql_ops={"company": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_bounty_region_trgm",
+            "region",
+            postgresql_using="gin",
+            postgresql_ops={"region": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_bounty_employment_type_trgm",
+            "employment_type",
+            postgresql_using="gin",
+            postgresql_ops={"employment_type": "gin_trgm_ops"},
+        ),
+        Index("ix_bounty_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    @hybrid_property
+    def skills_normalized(self) -> list[str]:
+        """Lower-cased skills; the SQL side is backed by a GIN expression index."""
+        return [skill.lower() for skill in self.skills or []]
+
+    @skills_normalized.inplace.expression
+    @classmethod
+    def _skills_normalized_expression(cls):
+        return cast(func.lower(cast(cls.skills, Text)), JSONB)
+
+
+Index(
+    "ix_bounty_skills_normalized",
+    Bounty.skills_normalized,
+    postgresql_using="gin",
+)
 
 
 class Application(Base):
@@ -165,7 +211,6 @@ class Application(Base):
         "ApplicationPrivateVersion",
         foreign_keys=[private_current_version_id],
         post_update=True,
-        lazy="joined",
     )
     deposits: Mapped[List["Deposit"]] = relationship(
         back_populates="application", cascade="all, delete-orphan", passive_deletes=True
@@ -177,6 +222,7 @@ class Application(Base):
     __table_args__ = (
         Index("ix_application_status", "status"),
         Index("ix_application_bounty_id", "bounty_id"),
+        Index("ix_application_created_at_id", "created_at", "id"),
     )
 
 
@@ -283,3 +329,27 @@ class Event(Base):
     __table_args__ = (
         Index("ix_events_entity", "entity_type", "entity_id"),
     )
+
+
+class AuthChallenge(Base):
+    """Outstanding sign-in challenges shared by every API worker.
+
+    The table is UNLOGGED: challenges are short-lived and safe to lose on a
+    crash, and skipping WAL keeps issue/consume cheap.
+    """
+
+    __tablename__ = "auth_challenges"
+
+    nonce: Mapped[str] = mapped_column(String(64), primary_key=True)
+    wallet: Mapped[str] = mapped_column(Text, nullable=False)
+    issued_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    purpose: Mapped[str] = mapped_column(Text, nullable=False)
+    domain: Mapped[str] = mapped_column(Text, nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+
+    __table_args__ = (
+        Index("ix_auth_challenges_expires_at", "expires_at"),
+        Index("ix_auth_challenges_wallet_issued_at", "wallet", "issued_at"),
+        {"prefixes": ["UNLOGGED"]},
+    )
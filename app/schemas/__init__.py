@@ -6,6 +6,12 @@ from .applications import (
     DepositCreate,
     DepositResponse,
     SampleResumeResponse,
+    PrivateUrlBatchRequest,
+    PrivateUrlBatchResponse,
+    PrivateUrlResult,
+    PrivateUploadFinalize,
+    PrivateUploadRequest,
+    PrivateUploadResponse,
     PrivateVersionResponse,
 )
 from .bounties import BountyCreate, BountyResponse, BountyUpdate
@@ -26,6 +32,12 @@ __all__ = [
     "DepositCreate",
     "DepositResponse",
     "SampleResumeResponse",
+    "PrivateUrlBatchRequest",
+    "PrivateUrlBatchResponse",
+    "PrivateUrlResult",
+    "PrivateUploadFinalize",
+    "PrivateUploadRequest",
+    "PrivateUploadResponse",
     "PrivateVersionResponse",
     "BountyCreate",
     "BountyResponse",
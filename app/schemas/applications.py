@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -31,7 +31,10 @@ class ApplicationCreate(BaseModel):
     )
     private_payload_base64: Optional[str] = Field(
         None,
-        description="Optional base64 encoded private profile to upload in-line; alternative is to request upload URL.",
+        description=(
+            "Deprecated: base64 encoded private profile uploaded in-line. Prefer "
+            "POST /applications/{id}/private-upload and uploading directly to storage."
+        ),
     )
 
 
@@ -80,6 +83,42 @@ class PrivateVersionResponse(BaseModel):
     payload_sha256: str
     uploaded_at: datetime
 
+    class Config:
+        from_attributes = True
+
+
+class PrivateUploadFinalize(BaseModel):
+    sha256: str = Field(..., pattern=r"^[0-9a-f]{64}$", description="Hex SHA-256 of the payload")
+    size: int = Field(..., gt=0, description="Payload size in bytes")
+
+
+class PrivateUploadRequest(PrivateUploadFinalize):
+    content_type: str = "application/json"
+
+
+class PrivateUploadResponse(BaseModel):
+    version_id: uuid.UUID
+    s3_key: str
+    url: str
+    headers: Dict[str, str] = Field(..., description="Headers the PUT must send unchanged")
+    expires_in: int
+
+
+class PrivateUrlBatchRequest(BaseModel):
+    application_ids: List[uuid.UUID] = Field(..., min_length=1)
+
+
+class PrivateUrlResult(BaseModel):
+    application_id: uuid.UUID
+    version_id: Optional[uuid.UUID] = None
+    url: Optional[str] = None
+    expires_in: Optional[int] = Field(None, description="Seconds until the URL expires")
+    error: Optional[str] = None
+
+
+class PrivateUrlBatchResponse(BaseModel):
+    results: List[PrivateUrlResult]
+
 
 class DepositCreate(BaseModel):
     amount: float = Field(..., gt=0)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -33,6 +33,25 @@ class VerifyResponse(BaseModel):
     token_expires_at: Optional[str] = None
 
 
+class VerifyBatchRequest(BaseModel):
+    items: List[VerifyRequest] = Field(..., min_length=1)
+
+
+class VerifyBatchItemResult(BaseModel):
+    ok: bool
+    wallet: Optional[str] = None
+    used_nonce: str
+    token: Optional[str] = Field(
+        None, description="Bearer token; batch verification cannot set one cookie per wallet"
+    )
+    token_expires_at: Optional[str] = None
+    error: Optional[str] = None
+
+
+class VerifyBatchResponse(BaseModel):
+    results: List[VerifyBatchItemResult]
+
+
 class ChallengeRecord(BaseModel):
     wallet: str
     nonce: str
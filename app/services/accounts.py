@@ -1,11 +1,122 @@
 from __future__ import annotations
 
-from typing import Optional
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional
 
-from sqlalchemy import select
+from sqlalchemy import event, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 
+from app.config import get_settings
 from app.models import Account, AccountRole
+from app.services.cache import TTLCache
+
+_settings = get_settings()
+
+# session.info key for accounts resolved in the current transaction; they are
+# only published to the cache once that transaction commits.
+_PENDING_KEY = "account_cache_pending"
+
+
+@dataclass(frozen=True)
+class AccountRef:
+    id: uuid.UUID
+    wallet: str
+    role: AccountRole
+    display_name: Optional[str]
+
+
+_account_cache: TTLCache[str, AccountRef] = TTLCache(
+    maxsize=_settings.ACCOUNT_CACHE_MAX_ENTRIES,
+    ttl_seconds=_settings.ACCOUNT_CACHE_TTL_SECONDS,
+)
+
+
+def _remember_pending(session: AsyncSession, accounts: Mapping[str, Account]) -> None:
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for wallet, account in accounts.items():
+        pending[wallet] = AccountRef(
+            id=account.id,
+            wallet=account.wallet,
+            role=account.role,
+            display_name=account.display_name,
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_accounts(session: Session) -> None:
+    for wallet, ref in session.info.pop(_PENDING_KEY, {}).items():
+        _account_cache.set(wallet, ref)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_accounts(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+@event.listens_for(Account, "after_update")
+@event.listens_for(Account, "after_delete")
+def _invalidate_changed_account(mapper, connection, target: Account) -> None:
+    invalidate_account(target.wallet)
+    session = object_session(target)
+    if session is not None:
+        session.info.get(_PENDING_KEY, {}).pop(target.wallet, None)
+
+
+def invalidate_account(wallet: str) -> None:
+    """Drop a wallet from the cache; ORM updates and deletes do this automatically."""
+    _account_cache.pop(wallet)
+
+
+def account_cache_stats() -> Dict[str, int]:
+    return _account_cache.stats()
+
+
+def _normalize_wallet(wallet: str) -> str:
+    normalized_wallet = wallet.strip()
+    if not normalized_wallet:
+        raise ValueError("wallet must be provided")
+    return normalized_wallet
+
+
+def _upsert_accounts_stmt(rows: list[dict]):
+    """Insert missing accounts and return every requested one in one statement.
+
+    ``ON CONFLICT DO NOTHING`` in a CTE creates missing wallets without
+    writing a new tuple for existing ones; the outer ``UNION ALL`` reads those
+    from the statement's snapshot. Concurrent first-time requests for one
+    wallet no longer race on the unique constraint, and existing role and
+    display name are left untouched.
+    """
+    table = Account.__table__
+    inserted = (
+        pg_insert(table)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[table.c.wallet])
+        .returning(*table.c)
+        .cte("inserted")
+    )
+    existing = select(table).where(table.c.wallet.in_([row["wallet"] for row in rows]))
+    return select(Account).from_statement(union_all(select(inserted), existing))
+
+
+async def _upsert_accounts(session: AsyncSession, rows: list[dict]) -> Dict[str, Account]:
+    result = await session.scalars(
+        _upsert_accounts_stmt(rows),
+        execution_options={"populate_existing": True},
+    )
+    accounts = {account.wallet: account for account in result.all()}
+    # A wallet inserted by a transaction that committed after this statement's
+    # snapshot was taken is skipped by DO NOTHING yet invisible to the outer
+    # read; a fresh statement sees it.
+    missing = [row["wallet"] for row in rows if row["wallet"] not in accounts]
+    if missing:
+        result = await session.scalars(select(Account).where(Account.wallet.in_(missing)))
+        accounts.update((account.wallet, account) for account in result.all())
+    _remember_pending(session, accounts)
+    return accounts
 
 
 async def get_or_create_account(
@@ -15,25 +126,60 @@ async def get_or_create_account(
     display_name: Optional[str] = None,
 ) -> Account:
     """Fetch an account by wallet or create it with the provided role."""
-    normalized_wallet = wallet.strip()
-    if not normalized_wallet:
-        raise ValueError("wallet must be provided")
-
-    result = await session.execute(
-        select(Account).where(Account.wallet == normalized_wallet)
-    )
-    account = result.scalar_one_or_none()
-    if account:
-        return account
-
-    account = Account(
-        wallet=normalized_wallet,
-        role=role,
-        display_name=display_name,
+    normalized_wallet = _normalize_wallet(wallet)
+    accounts = await _upsert_accounts(
+        session, [{"wallet": normalized_wallet, "role": role, "display_name": display_name}]
     )
-    session.add(account)
-    await session.flush()
-    return account
+    return accounts[normalized_wallet]
+
+
+async def get_or_create_accounts(
+    session: AsyncSession, wallets: Mapping[str, AccountRole]
+) -> Dict[str, Account]:
+    """Resolve several wallets in one statement, creating any that are missing.
+
+    Returns a mapping keyed by the normalized wallet.
+    """
+    roles: Dict[str, AccountRole] = {}
+    for wallet, role in wallets.items():
+        roles.setdefault(_normalize_wallet(wallet), role)
+    if not roles:
+        return {}
+
+    # Stable ordering keeps concurrent inserts from deadlocking on the unique index.
+    rows = [{"wallet": wallet, "role": roles[wallet]} for wallet in sorted(roles)]
+    return await _upsert_accounts(session, rows)
+
+
+async def resolve_account_ids(
+    session: AsyncSession, wallets: Mapping[str, AccountRole]
+) -> Dict[str, uuid.UUID]:
+    """Map wallets to account IDs, hitting the database only for cache misses.
+
+    Missing accounts are created with the given role. Returns a mapping keyed
+    by the normalized wallet.
+    """
+    resolved: Dict[str, uuid.UUID] = {}
+    misses: Dict[str, AccountRole] = {}
+    for wallet, role in wallets.items():
+        normalized_wallet = _normalize_wallet(wallet)
+        ref = _account_cache.get(normalized_wallet)
+        if ref is not None:
+            resolved[normalized_wallet] = ref.id
+        else:
+            misses.setdefault(normalized_wallet, role)
+
+    if misses:
+        accounts = await get_or_create_accounts(session, misses)
+        resolved.update({wallet: account.id for wallet, account in accounts.items()})
+    return resolved
+
+
+async def resolve_account_id(
+    session: AsyncSession, wallet: str, role: AccountRole
+) -> uuid.UUID:
+    resolved = await resolve_account_ids(session, {wallet: role})
+    return resolved[_normalize_wallet(wallet)]
 
 
 async def get_account_by_wallet(
@@ -41,4 +187,3 @@ async def get_account_by_wallet(
 ) -> Optional[Account]:
     result = await session.execute(select(Account).where(Account.wallet == wallet))
     return result.scalar_one_or_none()
-
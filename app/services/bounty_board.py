@@ -0,0 +1,148 @@
+"""In-process cache of rendered bounty board pages.
+
+Pages are cached under ``(version, key)``. Any bounty write bumps the version
+in this worker after its commit, and a ``NOTIFY bounty_board`` sent inside
+the writing transaction makes every other worker (each holding a ``LISTEN``
+connection) do the same. A TTL bounds staleness should a notification be
+missed, for instance while the listener is reconnecting. ``LISTEN`` needs a
+session-level connection, so behind a transaction-pooling PgBouncer the
+listener receives nothing and only the TTL bounds staleness.
+
+Concurrent misses for one key share a single load (single-flight), so a cold
+or freshly invalidated cache costs one query rather than one per request.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+BOUNTY_BOARD_CHANNEL = "bounty_board"
+_LISTEN_RETRY_SECONDS = (1, 2, 5, 10, 30)
+
+V = TypeVar("V")
+
+
+class VersionedCache(Generic[V]):
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self._entries: TTLCache[Tuple[int, Hashable], V] = TTLCache(maxsize, ttl_seconds)
+        self._inflight: Dict[Tuple[int, Hashable], "asyncio.Future[V]"] = {}
+        self._version = 0
+        self.coalesced = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> V:
+        cache_key = (self._version, key)
+        value = self._entries.get(cache_key)
+        if value is not None:
+            return value
+        task = self._inflight.get(cache_key)
+        if task is None:
+            # The load runs as its own task so a cancelled request does not
+            # cancel it for everyone else waiting on the same key.
+            task = asyncio.ensure_future(self._load(cache_key, loader))
+            self._inflight[cache_key] = task
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    async def _load(self, cache_key: Tuple[int, Hashable], loader: Callable[[], Awaitable[V]]) -> V:
+        try:
+            value = await loader()
+            # Results of loads that raced an invalidation are not cached.
+            if cache_key[0] == self._version:
+                self._entries.set(cache_key, value)
+            return value
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self._entries.stats(),
+            "version": self._version,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+
+bounty_board_cache: VersionedCache = VersionedCache(
+    maxsize=settings.BOUNTY_BOARD_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.BOUNTY_BOARD_CACHE_TTL_SECONDS,
+)
+
+
+async def notify_bounty_board_changed(session: AsyncSession) -> None:
+    """Queue a ``NOTIFY`` in the session's transaction; Postgres sends it on commit."""
+    await session.execute(select(func.pg_notify(BOUNTY_BOARD_CHANNEL, "")))
+
+
+def _listener_dsn() -> str:
+    # NOTIFY is not replayed to replicas, so always listen on the primary.
+    url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+async def _listen_forever() -> None:
+    attempt = 0
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(_listener_dsn())
+            closed = asyncio.Event()
+            conn.add_termination_listener(lambda _conn: closed.set())
+            await conn.add_listener(
+                BOUNTY_BOARD_CHANNEL, lambda *_args: bounty_board_cache.invalidate()
+            )
+            attempt = 0
+            # Writes may have been missed while disconnected.
+            bounty_board_cache.invalidate()
+            await closed.wait()
+            logger.warning("bounty board LISTEN connection lost; reconnecting")
+            continue
+        except Exception as exc:  # noqa: BLE001 - retried below
+            delay = _LISTEN_RETRY_SECONDS[min(attempt, len(_LISTEN_RETRY_SECONDS) - 1)]
+            attempt += 1
+            logger.warning("bounty board LISTEN failed (%s); retrying in %ss", exc, delay)
+        finally:
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+        await asyncio.sleep(delay)
+
+
+_listener_task: Optional["asyncio.Task[None]"] = None
+
+
+def start_bounty_board_listener() -> None:
+    global _listener_task
+    if _listener_task is None:
+        _listener_task = asyncio.ensure_future(_listen_forever())
+
+
+async def stop_bounty_board_listener() -> None:
+    global _listener_task
+    task, _listener_task = _listener_task, None
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
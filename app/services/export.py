@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Iterable, Literal, Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+
+from app.db import get_read_session
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# Rows fetched per round trip from the server-side cursor.
+EXPORT_BATCH_SIZE = 500
+
+_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+def csv_header(schema: Type[BaseModel]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(schema.model_fields.keys())
+    return buffer.getvalue().encode("utf-8")
+
+
+def encode_ndjson(rows: Iterable[Any], schema: Type[BaseModel]) -> bytes:
+    return b"".join(
+        schema.model_validate(row).model_dump_json().encode("utf-8") + b"\n" for row in rows
+    )
+
+
+def encode_csv(rows: Iterable[Any], schema: Type[BaseModel]) -> bytes:
+    fields = list(schema.model_fields.keys())
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        data = schema.model_validate(row).model_dump(mode="json")
+        writer.writerow([_csv_value(data[field]) for field in fields])
+    return buffer.getvalue().encode("utf-8")
+
+
+async def _iter_export(
+    stmt: Select, schema: Type[BaseModel], fmt: ExportFormat
+) -> AsyncIterator[bytes]:
+    if fmt == "csv":
+        yield csv_header(schema)
+    encode = encode_csv if fmt == "csv" else encode_ndjson
+
+    # The session is owned by the generator rather than a request dependency so
+    # it stays open for as long as the response body is being sent.
+    async with get_read_session() as session:
+        result = await session.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for batch in result.scalars().partitions():
+            yield encode(batch, schema)
+
+
+def export_response(
+    stmt: Select, schema: Type[BaseModel], fmt: ExportFormat, filename: str
+) -> StreamingResponse:
+    """Stream ``stmt`` from a server-side cursor, encoded one batch at a time."""
+    extension = "csv" if fmt == "csv" else "ndjson"
+    return StreamingResponse(
+        _iter_export(stmt, schema, fmt),
+        media_type=_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'},
+    )
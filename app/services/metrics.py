@@ -0,0 +1,168 @@
+"""Minimal in-process metrics rendered in the Prometheus text format.
+
+Metrics are only updated from the event loop, so there is no locking.
+Values that already live elsewhere (pool, caches, queues) are read at scrape
+time through collectors instead of being mirrored into gauges.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+# (name, labels, value); name may carry a suffix such as ``_bucket``.
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_sample(name: str, labels: Dict[str, str], value: float) -> str:
+    if labels:
+        rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+        return f"{name}{{{rendered}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+
+    def _labels(self, values: Labels) -> Dict[str, str]:
+        return dict(zip(self.label_names, values))
+
+    @abstractmethod
+    def samples(self) -> Iterable[Sample]:
+        """Samples to render, in exposition order."""
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in self._values.items():
+            yield self.name, self._labels(labels), value
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per-bucket (non-cumulative) counts plus a trailing +Inf slot.
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, counts in self._counts.items():
+            base = self._labels(labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**base, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", base, self._sums[labels]
+            yield f"{self.name}_count", base, cumulative
+
+
+# A collector returns (name, type, help, samples) families at scrape time.
+MetricFamily = Tuple[str, str, str, Iterable[Sample]]
+Collector = Callable[[], Iterable[MetricFamily]]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Collector] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def _families(self) -> Iterable[MetricFamily]:
+        for metric in self._metrics:
+            yield metric.name, metric.type_name, metric.documentation, metric.samples()
+        for collector in self._collectors:
+            yield from collector()
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name, type_name, documentation, samples in self._families():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {type_name}")
+            lines.extend(_format_sample(*sample) for sample in samples)
+        lines.append("")
+        return "\n".join(lines)
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.register(
+    Counter(
+        "http_requests_total",
+        "HTTP requests by method, route template and status class.",
+        ("method", "route", "status"),
+    )
+)
+http_request_duration_seconds = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by method and route template.",
+        ("method", "route"),
+    )
+)
+http_requests_in_flight = registry.register(
+    Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+)
@@ -0,0 +1,348 @@
+"""Async S3 client: httpx for transport, botocore only for SigV4 signing.
+
+Requests run on the event loop over a bounded keep-alive pool instead of
+occupying executor threads. Throttling, 5xx responses and transport errors
+are retried with capped, jittered exponential backoff; each attempt is
+re-signed. The payload is hashed once per request, off the event loop for
+large bodies such as multipart parts.
+
+``S3Presigner`` builds SigV4 query-string URLs locally, reusing the derived
+signing key for the whole UTC day.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import random
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+from xml.sax.saxutils import escape
+from urllib.parse import quote, urlsplit
+
+import httpx
+from botocore.auth import S3SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.credentials import Credentials
+from botocore.exceptions import NoCredentialsError
+
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Bodies at least this large are hashed off the event loop.
+_HASH_IN_THREAD_BYTES = 64 * 1024
+_BACKOFF_BASE_SECONDS = 0.1
+_BACKOFF_MAX_SECONDS = 5.0
+
+
+def object_url(endpoint_url: Optional[str], region: str, bucket: str, key: str = "") -> str:
+    path = quote(key, safe="/~")
+    if endpoint_url:
+        # Custom endpoints (MinIO, moto) are addressed path-style.
+        return f"{endpoint_url.rstrip('/')}/{bucket}/{path}"
+    return f"https://{bucket}.s3.{region}.amazonaws.com/{path}"
+
+
+def _uri_encode(value: str) -> str:
+    return quote(value, safe="-_.~")
+
+
+class S3Presigner:
+    def __init__(
+        self, *, credentials: Optional[Credentials], region: str, endpoint_url: Optional[str] = None
+    ) -> None:
+        self._credentials = credentials
+        self._region = region
+        self._endpoint_url = endpoint_url
+        # (date, secret key, derived key): one HMAC instead of four per URL.
+        self._signing_key: Optional[Tuple[str, str, bytes]] = None
+
+    def _key_for(self, date: str, secret_key: str) -> bytes:
+        cached = self._signing_key
+        if cached is not None and cached[0] == date and cached[1] == secret_key:
+            return cached[2]
+        key = ("AWS4" + secret_key).encode()
+        for part in (date, self._region, "s3", "aws4_request"):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        self._signing_key = (date, secret_key, key)
+        return key
+
+    def presign(
+        self,
+        method: str,
+        bucket: str,
+        key: str,
+        expires_in: int,
+        headers: Optional[Mapping[str, str]] = None,
+        now: Optional[datetime] = None,
+    ) -> str:
+        """Presigned URL for ``method`` on ``bucket/key``.
+
+        ``headers`` are signed, so the client must send them with exactly
+        these values.
+        """
+        if self._credentials is None:
+            raise NoCredentialsError()
+        creds = self._credentials.get_frozen_credentials()
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date = amz_date[:8]
+        scope = f"{date}/{self._region}/s3/aws4_request"
+
+        url = object_url(self._endpoint_url, self._region, bucket, key)
+        parts = urlsplit(url)
+        signed = {"host": parts.netloc}
+        for name, value in (headers or {}).items():
+            signed[name.lower()] = " ".join(str(value).split())
+        signed_names = ";".join(sorted(signed))
+
+        params = {
+            "X-Amz-Algorithm": "AWS4-HMAC-SHA256",
+            "X-Amz-Credential": f"{creds.access_key}/{scope}",
+            "X-Amz-Date": amz_date,
+            "X-Amz-Expires": str(expires_in),
+            "X-Amz-SignedHeaders": signed_names,
+        }
+        if creds.token:
+            params["X-Amz-Security-Token"] = creds.token
+        query = "&".join(
+            f"{_uri_encode(name)}={_uri_encode(value)}" for name, value in sorted(params.items())
+        )
+        canonical_request = "\n".join(
+            (
+                method,
+                parts.path or "/",
+                query,
+                "".join(f"{name}:{signed[name]}\n" for name in sorted(signed)),
+                signed_names,
+                "UNSIGNED-PAYLOAD",
+            )
+        )
+        string_to_sign = "\n".join(
+            (
+                "AWS4-HMAC-SHA256",
+                amz_date,
+                scope,
+                hashlib.sha256(canonical_request.encode()).hexdigest(),
+            )
+        )
+        signature = hmac.new(
+            self._key_for(date, creds.secret_key), string_to_sign.encode(), hashlib.sha256
+        ).hexdigest()
+        return f"{url}?{query}&X-Amz-Signature={signature}"
+
+
+class _PrehashedS3SigV4Auth(S3SigV4Auth):
+    """SigV4 signer that uses a payload digest computed ahead of time.
+
+    botocore would otherwise hash the body on every ``add_auth`` call, on the
+    event loop and again for each retry.
+    """
+
+    def __init__(self, credentials, service_name: str, region_name: str, payload_sha256: str):
+        super().__init__(credentials, service_name, region_name)
+        self._payload_sha256 = payload_sha256
+
+    def payload(self, request) -> str:
+        return self._payload_sha256
+
+
+async def _payload_sha256(body: bytes) -> str:
+    if len(body) < _HASH_IN_THREAD_BYTES:
+        return hashlib.sha256(body).hexdigest()
+    # hashlib releases the GIL for large buffers, so this runs in parallel.
+    return await asyncio.to_thread(lambda: hashlib.sha256(body).hexdigest())
+
+
+class S3Error(Exception):
+    def __init__(self, status_code: int, body: bytes) -> None:
+        super().__init__(f"S3 returned {status_code}: {body[:200]!r}")
+        self.status_code = status_code
+        self.body = body
+
+
+class AsyncS3Client:
+    def __init__(
+        self,
+        *,
+        credentials: Optional[Credentials],
+        region: str,
+        endpoint_url: Optional[str] = None,
+        max_connections: int = 50,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 30.0,
+        max_attempts: int = 3,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self._credentials = credentials
+        self._region = region
+        self._endpoint_url = endpoint_url
+        self._max_attempts = max(1, max_attempts)
+        self._limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections
+        )
+        # Waiting for a free pooled connection counts against connect_timeout.
+        self._timeout = httpx.Timeout(read_timeout, connect=connect_timeout, pool=connect_timeout)
+        self._transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+        self.in_flight = 0
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                limits=self._limits, timeout=self._timeout, transport=self._transport
+            )
+        return self._http
+
+    def object_url(self, bucket: str, key: str = "") -> str:
+        return object_url(self._endpoint_url, self._region, bucket, key)
+
+    def _signed_headers(
+        self, method: str, url: str, body: bytes, headers: Mapping[str, str], payload_sha256: str
+    ) -> Dict[str, str]:
+        request = AWSRequest(method=method, url=url, data=body, headers=dict(headers))
+        if self._credentials is not None:
+            _PrehashedS3SigV4Auth(
+                self._credentials.get_frozen_credentials(), "s3", self._region, payload_sha256
+            ).add_auth(request)
+        return dict(request.headers.items())
+
+    async def request(
+        self,
+        method: str,
+        bucket: str,
+        key: str = "",
+        *,
+        body: bytes = b"",
+        headers: Optional[Mapping[str, str]] = None,
+        params: Optional[Mapping[str, str]] = None,
+        expected: frozenset = frozenset({200}),
+    ) -> httpx.Response:
+        url = self.object_url(bucket, key)
+        if params:
+            url = f"{url}?{httpx.QueryParams(params)}"
+        client = self._client()
+        self.in_flight += 1
+        try:
+            # Hashed once; every attempt is re-signed with the same digest.
+            payload_sha256 = await _payload_sha256(body)
+            for attempt in range(1, self._max_attempts + 1):
+                signed = self._signed_headers(method, url, body, headers or {}, payload_sha256)
+                try:
+                    response = await client.request(method, url, content=body, headers=signed)
+                except httpx.TransportError:
+                    if attempt == self._max_attempts:
+                        raise
+                else:
+                    if response.status_code in expected:
+                        return response
+                    if (
+                        response.status_code not in _RETRY_STATUSES
+                        or attempt == self._max_attempts
+                    ):
+                        raise S3Error(response.status_code, response.content)
+                delay = min(_BACKOFF_MAX_SECONDS, _BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+                await asyncio.sleep(random.uniform(0, delay))
+            raise AssertionError("unreachable")
+        finally:
+            self.in_flight -= 1
+
+    async def put_object(
+        self,
+        bucket: str,
+        key: str,
+        body: bytes,
+        content_type: str = "application/octet-stream",
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> httpx.Response:
+        return await self.request(
+            "PUT",
+            bucket,
+            key,
+            body=body,
+            headers={"Content-Type": content_type, **(headers or {})},
+        )
+
+    async def head_object(
+        self, bucket: str, key: str, checksum_mode: bool = False
+    ) -> Optional[httpx.Headers]:
+        """Object metadata headers, or ``None`` if the object does not exist.
+
+        With ``checksum_mode`` S3 also returns the stored ``x-amz-checksum-*``.
+        """
+        headers = {"x-amz-checksum-mode": "ENABLED"} if checksum_mode else None
+        response = await self.request(
+            "HEAD", bucket, key, headers=headers, expected=frozenset({200, 404})
+        )
+        return response.headers if response.status_code == 200 else None
+
+    async def delete_object(self, bucket: str, key: str) -> None:
+        await self.request("DELETE", bucket, key, expected=frozenset({200, 204}))
+
+    async def create_multipart_upload(
+        self, bucket: str, key: str, content_type: str = "application/octet-stream"
+    ) -> str:
+        response = await self.request(
+            "POST", bucket, key, headers={"Content-Type": content_type}, params={"uploads": ""}
+        )
+        return ET.fromstring(response.content).findtext("{*}UploadId")
+
+    async def upload_part(
+        self, bucket: str, key: str, upload_id: str, part_number: int, body: bytes
+    ) -> str:
+        """Upload one part and return its ETag."""
+        response = await self.request(
+            "PUT",
+            bucket,
+            key,
+            body=body,
+            params={"partNumber": str(part_number), "uploadId": upload_id},
+        )
+        return response.headers["etag"]
+
+    async def complete_multipart_upload(
+        self, bucket: str, key: str, upload_id: str, parts: Iterable[Tuple[int, str]]
+    ) -> None:
+        body = "".join(
+            f"<Part><PartNumber>{number}</PartNumber><ETag>{escape(etag)}</ETag></Part>"
+            for number, etag in parts
+        )
+        response = await self.request(
+            "POST",
+            bucket,
+            key,
+            body=f"<CompleteMultipartUpload>{body}</CompleteMultipartUpload>".encode(),
+            headers={"Content-Type": "application/xml"},
+            params={"uploadId": upload_id},
+        )
+        # S3 can report a failed completion inside a 200 response.
+        if b"<Error>" in response.content:
+            raise S3Error(response.status_code, response.content)
+
+    async def abort_multipart_upload(self, bucket: str, key: str, upload_id: str) -> None:
+        await self.request(
+            "DELETE",
+            bucket,
+            key,
+            params={"uploadId": upload_id},
+            expected=frozenset({204, 404}),
+        )
+
+    async def bucket_exists(self, bucket: str) -> bool:
+        response = await self.request("HEAD", bucket, expected=frozenset({200, 404}))
+        return response.status_code == 200
+
+    async def create_bucket(self, bucket: str) -> None:
+        body = b""
+        if self._region != "us-east-1":
+            body = (
+                '<CreateBucketConfiguration xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+                f"<LocationConstraint>{self._region}</LocationConstraint>"
+                "</CreateBucketConfiguration>"
+            ).encode()
+        # 409: created concurrently by another worker.
+        await self.request("PUT", bucket, body=body, expected=frozenset({200, 409}))
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
@@ -0,0 +1,136 @@
+"""Per-request SQL statement counts, timings and N+1 detection.
+
+Engine-level cursor events record into a ``RequestSqlStats`` held in a
+context variable, which ``SqlStatsMiddleware`` installs for each HTTP request.
+Finished requests are folded into per-route totals for ``/metrics/sql``.
+Statements outside a request (startup, background work) are only subject to
+the slow-query log.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+DB_SLOW_QUERY_SECONDS = settings.DB_SLOW_QUERY_MS / 1000
+SQL_N_PLUS_ONE_THRESHOLD = settings.SQL_N_PLUS_ONE_THRESHOLD
+
+_STATEMENT_LOG_CHARS = 500
+
+
+@dataclass
+class RequestSqlStats:
+    count: int = 0
+    seconds: float = 0.0
+    slow: int = 0
+    statements: Counter = field(default_factory=Counter)
+
+    def repeated(self, threshold: int = SQL_N_PLUS_ONE_THRESHOLD) -> Dict[str, int]:
+        """Statements issued at least ``threshold`` times: likely N+1 loads."""
+        if threshold <= 0:
+            return {}
+        return {sql: n for sql, n in self.statements.items() if n >= threshold}
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.2f};desc="{self.count} queries"'
+
+
+@dataclass
+class RouteSqlTotals:
+    requests: int = 0
+    statements: int = 0
+    db_seconds: float = 0.0
+    slow_queries: int = 0
+    n_plus_one: int = 0
+
+
+_current: ContextVar[Optional[RequestSqlStats]] = ContextVar("request_sql_stats", default=None)
+_route_totals: Dict[str, RouteSqlTotals] = {}
+_route_totals_lock = threading.Lock()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("sql_stats_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["sql_stats_started"].pop()
+    slow = DB_SLOW_QUERY_SECONDS > 0 and elapsed >= DB_SLOW_QUERY_SECONDS
+    if slow:
+        logger.warning(
+            "slow query (%.1f ms): %s", elapsed * 1000, statement[:_STATEMENT_LOG_CHARS]
+        )
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.count += 1
+    stats.seconds += elapsed
+    stats.slow += slow
+    stats.statements[statement] += 1
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_failed_timer(exception_context) -> None:
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("sql_stats_started"):
+        conn.info["sql_stats_started"].pop()
+
+
+def begin_request() -> Token:
+    return _current.set(RequestSqlStats())
+
+
+def current_request_stats() -> Optional[RequestSqlStats]:
+    return _current.get()
+
+
+def end_request(token: Token, route: str) -> None:
+    """Uninstall the request's stats and add them to the route's totals."""
+    stats = _current.get()
+    _current.reset(token)
+    if stats is None:
+        return
+    repeated = stats.repeated()
+    for sql, n in repeated.items():
+        logger.warning(
+            "possible N+1 on %s: statement ran %d times: %s",
+            route,
+            n,
+            sql[:_STATEMENT_LOG_CHARS],
+        )
+    with _route_totals_lock:
+        totals = _route_totals.setdefault(route, RouteSqlTotals())
+        totals.requests += 1
+        totals.statements += stats.count
+        totals.db_seconds += stats.seconds
+        totals.slow_queries += stats.slow
+        totals.n_plus_one += bool(repeated)
+
+
+def sql_stats_snapshot() -> Dict[str, Dict[str, float]]:
+    with _route_totals_lock:
+        return {
+            route: {
+                "requests": totals.requests,
+                "statements": totals.statements,
+                "statements_per_request": round(totals.statements / totals.requests, 2),
+                "db_seconds": round(totals.db_seconds, 6),
+                "slow_queries": totals.slow_queries,
+                "n_plus_one_requests": totals.n_plus_one,
+            }
+            for route, totals in sorted(_route_totals.items())
+        }
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import base64
 import hashlib
+import logging
+import time
 import uuid
 from dataclasses import dataclass
-from typing import Optional
+from typing import AsyncIterable, Dict, Iterable, List, Optional, Tuple
 
 import boto3
-from botocore.client import BaseClient
-from botocore.config import Config
-from botocore.exceptions import ClientError
 
 from app.config import get_settings
+from app.services.cache import TTLCache
+from app.services.s3 import AsyncS3Client, S3Presigner
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -20,6 +25,24 @@ class PresignedUrl:
     fields: Optional[dict] = None
 
 
+@dataclass
+class ObjectMetadata:
+    size: int
+    checksum_sha256: Optional[str]  # hex, when S3 stored one
+
+
+@dataclass
+class StreamedUpload:
+    size: int
+    sha256: str  # hex
+
+
+class UploadTooLarge(Exception):
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__(f"upload exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
 class PrivateStorageService:
     """Wrapper around S3 (or compatible) for applicant private data."""
 
@@ -30,33 +53,45 @@ class PrivateStorageService:
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
             region_name=settings.AWS_REGION,
         )
-        self._client: BaseClient = session.client(
-            "s3",
+        # The boto3 session only resolves credentials; all S3 traffic goes
+        # through the async client.
+        credentials = session.get_credentials()
+        self._async_client = AsyncS3Client(
+            credentials=credentials,
+            region=settings.AWS_REGION,
+            endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+            max_connections=settings.S3_MAX_CONNECTIONS,
+            connect_timeout=settings.S3_CONNECT_TIMEOUT_SECONDS,
+            read_timeout=settings.S3_READ_TIMEOUT_SECONDS,
+            max_attempts=settings.S3_MAX_ATTEMPTS,
+        )
+        self._presigner = S3Presigner(
+            credentials=credentials,
+            region=settings.AWS_REGION,
             endpoint_url=settings.AWS_S3_ENDPOINT_URL,
-            config=Config(signature_version="s3v4"),
         )
         self._bucket = settings.S3_PRIVATE_BUCKET
         self._expires = settings.S3_PRESIGN_EXPIRES_SECONDS
+        # GET URLs are handed out again until fewer than
+        # S3_PRESIGN_MIN_REMAINING_SECONDS of their lifetime are left.
+        self._get_urls: TTLCache[str, Tuple[str, float]] = TTLCache(
+            maxsize=settings.S3_PRESIGN_CACHE_MAX_ENTRIES,
+            ttl_seconds=self._expires - settings.S3_PRESIGN_MIN_REMAINING_SECONDS,
+        )
+        self._part_size = max(settings.S3_MULTIPART_PART_SIZE_BYTES, 5 * 1024 * 1024)
+        self._part_concurrency = max(1, settings.S3_MULTIPART_CONCURRENCY)
         self._bucket_ensured = False
-        self._region = settings.AWS_REGION
+        self._bucket_lock = asyncio.Lock()
 
-    def _ensure_bucket(self) -> None:
+    async def _ensure_bucket_async(self) -> None:
         if self._bucket_ensured:
             return
-        try:
-            self._client.head_bucket(Bucket=self._bucket)
-        except ClientError as exc:  # pragma: no cover - AWS client error codes vary
-            error_code = exc.response.get("Error", {}).get("Code", "") if exc.response else ""
-            if error_code in {"404", "NoSuchBucket", "NotFound"}:
-                params = {"Bucket": self._bucket}
-                if self._region and self._region != "us-east-1":
-                    params["CreateBucketConfiguration"] = {
-                        "LocationConstraint": self._region
-                    }
-                self._client.create_bucket(**params)
-            else:
-                raise
-        self._bucket_ensured = True
+        async with self._bucket_lock:
+            if self._bucket_ensured:
+                return
+            if not await self._async_client.bucket_exists(self._bucket):
+                await self._async_client.create_bucket(self._bucket)
+            self._bucket_ensured = True
 
     @staticmethod
     def build_private_key(application_id: uuid.UUID, version_id: uuid.UUID, filename: str = "profile.json") -> str:
@@ -68,34 +103,160 @@ class PrivateStorageService:
     ) -> str:
         return f"applications/{application_id}/attachments/{version_id}/{filename}"
 
-    def generate_put_url(self, key: str, content_type: str = "application/json") -> PresignedUrl:
-        self._ensure_bucket()
-        url = self._client.generate_presigned_url(
-            ClientMethod="put_object",
-            Params={"Bucket": self._bucket, "Key": key, "ContentType": content_type},
-            ExpiresIn=self._expires,
+    async def generate_put_url(
+        self, key: str, content_type: str = "application/json"
+    ) -> PresignedUrl:
+        await self._ensure_bucket_async()
+        url = self._presigner.presign(
+            "PUT", self._bucket, key, self._expires, headers={"Content-Type": content_type}
         )
         return PresignedUrl(url=url, expires_in=self._expires)
 
-    def generate_get_url(self, key: str) -> PresignedUrl:
-        self._ensure_bucket()
-        url = self._client.generate_presigned_url(
-            ClientMethod="get_object",
-            Params={"Bucket": self._bucket, "Key": key},
-            ExpiresIn=self._expires,
-        )
-        return PresignedUrl(url=url, expires_in=self._expires)
+    async def presign_checked_put(
+        self, key: str, sha256_hex: str, size: int, content_type: str = "application/json"
+    ) -> PresignedUrl:
+        """PUT URL that only accepts a body of exactly ``size`` bytes hashing to ``sha256_hex``.
+
+        S3 checks the body against the signed ``x-amz-checksum-sha256`` and
+        stores the checksum with the object. ``fields`` holds the headers the
+        client has to send.
+        """
+        await self._ensure_bucket_async()
+        headers = {
+            "Content-Type": content_type,
+            "Content-Length": str(size),
+            "x-amz-sdk-checksum-algorithm": "SHA256",
+            "x-amz-checksum-sha256": base64.b64encode(bytes.fromhex(sha256_hex)).decode(),
+        }
+        url = self._presigner.presign("PUT", self._bucket, key, self._expires, headers=headers)
+        return PresignedUrl(url=url, expires_in=self._expires, fields=headers)
 
-    def put_object(self, key: str, content: bytes, content_type: str = "application/json") -> None:
-        self._ensure_bucket()
-        self._client.put_object(
-            Bucket=self._bucket, Key=key, Body=content, ContentType=content_type
+    async def head_object_async(self, key: str) -> Optional[ObjectMetadata]:
+        headers = await self._async_client.head_object(self._bucket, key, checksum_mode=True)
+        if headers is None:
+            return None
+        checksum = headers.get("x-amz-checksum-sha256")
+        return ObjectMetadata(
+            size=int(headers["content-length"]),
+            checksum_sha256=base64.b64decode(checksum).hex() if checksum else None,
         )
 
+    def generate_get_url(self, key: str) -> PresignedUrl:
+        # Objects only exist once uploaded, which already ensured the bucket.
+        now = time.time()
+        cached = self._get_urls.get(key)
+        if cached is None:
+            url = self._presigner.presign("GET", self._bucket, key, self._expires)
+            cached = (url, now + self._expires)
+            self._get_urls.set(key, cached)
+        url, expires_at = cached
+        return PresignedUrl(url=url, expires_in=int(expires_at - now))
+
+    def generate_get_urls(self, keys: Iterable[str]) -> Dict[str, PresignedUrl]:
+        return {key: self.generate_get_url(key) for key in keys}
+
+    def presign_cache_stats(self) -> Dict[str, int]:
+        return self._get_urls.stats()
+
+    async def put_object_async(
+        self, key: str, content: bytes, content_type: str = "application/json"
+    ) -> None:
+        await self._ensure_bucket_async()
+        await self._async_client.put_object(self._bucket, key, content, content_type)
+
+    async def upload_stream(
+        self,
+        key: str,
+        chunks: AsyncIterable[bytes],
+        content_type: str = "application/octet-stream",
+        max_bytes: Optional[int] = None,
+    ) -> StreamedUpload:
+        """Upload a body of unknown length without holding it in memory.
+
+        Chunks are hashed as they arrive and cut into multipart parts. At most
+        ``S3_MULTIPART_CONCURRENCY`` parts are in flight; reading the body
+        waits for a free slot, so one upload buffers at most
+        ``(concurrency + 1) * part size`` bytes. Bodies that fit in one part
+        are sent with a single PUT. A failed or oversized upload is aborted.
+        """
+        await self._ensure_bucket_async()
+        client = self._async_client
+        part_size = self._part_size
+        slots = asyncio.Semaphore(self._part_concurrency)
+        digest = hashlib.sha256()
+        size = 0
+        buffer = bytearray()
+        upload_id: Optional[str] = None
+        etags: Dict[int, str] = {}
+        tasks: List["asyncio.Task[None]"] = []
+
+        async def send_part(number: int, data: bytes) -> None:
+            try:
+                etags[number] = await client.upload_part(self._bucket, key, upload_id, number, data)
+            finally:
+                slots.release()
+
+        async def start_part(data: bytes) -> None:
+            await slots.acquire()
+            for task in tasks:
+                if task.done() and task.exception() is not None:
+                    slots.release()
+                    raise task.exception()
+            tasks.append(asyncio.ensure_future(send_part(len(tasks) + 1, data)))
+
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                buffer += chunk
+                while len(buffer) >= part_size:
+                    if upload_id is None:
+                        upload_id = await client.create_multipart_upload(
+                            self._bucket, key, content_type
+                        )
+                    with memoryview(buffer) as view:
+                        part = bytes(view[:part_size])
+                    del buffer[:part_size]
+                    await start_part(part)
+
+            if upload_id is None:
+                await client.put_object(self._bucket, key, bytes(buffer), content_type)
+            else:
+                if buffer:
+                    await start_part(bytes(buffer))
+                    buffer.clear()
+                await asyncio.gather(*tasks)
+                await client.complete_multipart_upload(
+                    self._bucket, key, upload_id, sorted(etags.items())
+                )
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if upload_id is not None:
+                try:
+                    await client.abort_multipart_upload(self._bucket, key, upload_id)
+                except Exception as exc:  # noqa: BLE001 - lifecycle rules reap leftovers
+                    logger.warning("failed to abort multipart upload %s: %s", upload_id, exc)
+            raise
+        return StreamedUpload(size=size, sha256=digest.hexdigest())
+
+    async def delete_object_async(self, key: str) -> None:
+        await self._async_client.delete_object(self._bucket, key)
+
+    def requests_in_flight(self) -> int:
+        return self._async_client.in_flight
+
+    async def aclose(self) -> None:
+        await self._async_client.aclose()
+
     @staticmethod
     def compute_sha256(content: bytes) -> str:
         return hashlib.sha256(content).hexdigest()
 
+
 _storage_service: Optional[PrivateStorageService] = None
 
 
@@ -104,3 +265,18 @@ def get_private_storage_service() -> PrivateStorageService:
     if _storage_service is None:
         _storage_service = PrivateStorageService()
     return _storage_service
+
+
+def storage_requests_in_flight() -> int:
+    return _storage_service.requests_in_flight() if _storage_service is not None else 0
+
+
+def presign_cache_stats() -> Dict[str, int]:
+    if _storage_service is None:
+        return {"size": 0, "hits": 0, "misses": 0}
+    return _storage_service.presign_cache_stats()
+
+
+async def close_private_storage_service() -> None:
+    if _storage_service is not None:
+        await _storage_service.aclose()
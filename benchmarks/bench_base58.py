@@ -0,0 +1,56 @@
+"""Per-call cost of base58 decoding and wallet key loading.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_base58
+
+``legacy`` is the character-by-character decoder that ``app.auth.auth`` used
+before ``app.auth.base58``.
+"""
+from __future__ import annotations
+
+import os
+import timeit
+
+from app.auth.auth import _load_verify_key, load_verify_key
+from app.auth.base58 import b58decode, b58encode
+
+_LEGACY_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_LEGACY_MAP = {c: i for i, c in enumerate(_LEGACY_ALPHABET)}
+
+
+def legacy_b58_decode(s: str) -> bytes:
+    n = 0
+    for ch in s:
+        if ch not in _LEGACY_MAP:
+            raise ValueError("invalid base58 character")
+        n = n * 58 + _LEGACY_MAP[ch]
+    full = n.to_bytes((n.bit_length() + 7) // 8, byteorder="big") or b"\x00"
+    leading_zeros = len(s) - len(s.lstrip("1"))
+    return b"\x00" * leading_zeros + full
+
+
+def _per_call_us(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main(number: int = 100_000) -> None:
+    pubkey = b58encode(os.urandom(32))
+    signature = b58encode(os.urandom(64))
+
+    for label, value in (("pubkey (32B)", pubkey), ("signature (64B)", signature)):
+        legacy = _per_call_us(lambda: legacy_b58_decode(value), number)
+        table = _per_call_us(lambda: b58decode(value), number)
+        print(f"{label:<16} legacy {legacy:6.2f}us  table {table:6.2f}us  ({legacy / table:.2f}x)")
+
+    def uncached():
+        _load_verify_key.cache_clear()
+        load_verify_key(pubkey)
+
+    cold = _per_call_us(uncached, number // 10)
+    warm = _per_call_us(lambda: load_verify_key(pubkey), number)
+    print(f"{'VerifyKey load':<16} cold   {cold:6.2f}us  cached {warm:6.2f}us  ({cold / warm:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Issue/verify throughput of the in-memory challenge store.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_challenge_store [outstanding] [operations]
+
+The store is pre-filled with ``outstanding`` live challenges (1M by default)
+before timing ``operations`` issue and consume calls against it. A second
+store, capped at ``outstanding``, then times issuing into a full store, where
+every call evicts the oldest challenge; its slowest call is reported too.
+"""
+from __future__ import annotations
+
+import math
+import sys
+import time
+from datetime import timedelta
+
+from app.auth.auth import now_utc
+from app.auth.challenges import InMemoryChallengeStore
+from app.schemas.auth import ChallengeRecord
+
+
+def _records(prefix: str, count: int, ttl_seconds: float):
+    issued = now_utc()
+    expires = issued + timedelta(seconds=ttl_seconds)
+    for i in range(count):
+        yield ChallengeRecord(
+            wallet=f"{prefix}-wallet-{i}",
+            nonce=f"{prefix}-{i}",
+            issued_at=issued,
+            expires_at=expires,
+            purpose="Login",
+            domain="example.com",
+            message="bench",
+        )
+
+
+def main(outstanding: int = 1_000_000, operations: int = 200_000) -> None:
+    store = InMemoryChallengeStore(max_outstanding=outstanding + operations + 1)
+
+    start = time.perf_counter()
+    for record in _records("live", outstanding, ttl_seconds=3600):
+        store.put_nowait(record)
+    print(f"prefill   {outstanding:>9,} challenges in {time.perf_counter() - start:6.2f}s")
+
+    records = list(_records("bench", operations, ttl_seconds=3600))
+
+    start = time.perf_counter()
+    for record in records:
+        store.put_nowait(record)
+    elapsed = time.perf_counter() - start
+    print(f"issue     {operations / elapsed:>12,.0f} ops/s")
+
+    start = time.perf_counter()
+    for record in records:
+        store.consume_nowait(record.nonce)
+    elapsed = time.perf_counter() - start
+    print(f"verify    {operations / elapsed:>12,.0f} ops/s")
+
+    # Let a batch expire, then time the issue/consume calls that drain it.
+    short_lived = list(_records("short", operations, ttl_seconds=5))
+    for record in short_lived:
+        store.put_nowait(record)
+    # Expiry has one-second resolution; wait until the whole batch is due.
+    time.sleep(max(0.0, math.ceil(short_lived[-1].expires_at.timestamp()) - time.time()) + 0.1)
+    slowest = 0.0
+    start = time.perf_counter()
+    calls = 0
+    while len(store) > outstanding:
+        call_start = time.perf_counter()
+        store.consume_nowait("missing")
+        slowest = max(slowest, time.perf_counter() - call_start)
+        calls += 1
+    print(
+        f"expire    {operations:>9,} challenges over {calls:,} calls in"
+        f" {time.perf_counter() - start:6.3f}s (slowest call {slowest * 1e6:.0f}us)"
+    )
+
+    # Issue into a full store: every call evicts, half of them per wallet.
+    full = InMemoryChallengeStore(max_outstanding=outstanding, max_per_wallet=2)
+    for record in _records("full", outstanding, ttl_seconds=3600):
+        full.put_nowait(record)
+    evicting = [
+        record.model_copy(update={"wallet": f"hot-wallet-{i // 2 % 1000}"}) if i % 2 else record
+        for i, record in enumerate(_records("evict", operations, ttl_seconds=3600))
+    ]
+    slowest = 0.0
+    start = time.perf_counter()
+    for record in evicting:
+        call_start = time.perf_counter()
+        full.put_nowait(record)
+        slowest = max(slowest, time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+    print(
+        f"at cap    {operations / elapsed:>12,.0f} ops/s"
+        f" (slowest call {slowest * 1e6:.0f}us, {len(full):,} held)"
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,127 @@
+"""Serialization cost of list responses, per 1k rows.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_json_rendering [rows]
+
+Rows are transient ORM instances shaped like what the list endpoints load.
+Compared paths:
+
+* ``stdlib``: ``jsonable_encoder`` + ``json.dumps`` (FastAPI's generic path)
+* ``type_adapter``: ``TypeAdapter(list[Schema])`` validation from attributes
+  + ``dump_json`` (FastAPI's path for routes with a ``response_model``)
+* ``row_renderer``: ``RowRenderer`` + orjson, used by the list endpoints
+"""
+from __future__ import annotations
+
+import json
+import sys
+import timeit
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.api.responses import ORJSONResponse, RowRenderer
+from app.auth.auth import now_utc
+from app.models import Application, ApplicationStatus, Bounty, BountyStatus
+from app.schemas import ApplicationResponse, BountyResponse
+
+
+def _bounties(count: int) -> list[Bounty]:
+    now = now_utc()
+    return [
+        Bounty(
+            id=uuid.uuid4(),
+            recruiter_id=uuid.uuid4(),
+            title="Senior Solana Engineer",
+            description="Build and audit on-chain programs for a payments protocol. " * 3,
+            reward_amount=Decimal("1500.00"),
+            currency="USDC",
+            escrow_account=None,
+            company="Orbit Talent",
+            region="Remote",
+            employment_type="contract",
+            skills=["Rust", "Solana", "TypeScript"],
+            status=BountyStatus.OPEN,
+            expires_at=now + timedelta(days=30),
+            created_at=now,
+            updated_at=now,
+        )
+        for _ in range(count)
+    ]
+
+
+def _applications(count: int) -> list[Application]:
+    now = now_utc()
+    profile = {
+        "skills": ["Rust", "Anchor"],
+        "experience_years": 4.0,
+        "region": "EU",
+        "bio_short": "Protocol engineer shipping audited Solana programs.",
+        "contact_price": "10% of bounty",
+        "headline": "Solana engineer",
+        "links": ["https://github.com/example"],
+    }
+    return [
+        Application(
+            id=uuid.uuid4(),
+            bounty_id=uuid.uuid4(),
+            applicant_wallet="9xQeWvG816bUx9EPjHmaT23yvVM2ZWbrrpZb9PusVFin",
+            referrer_wallet=None,
+            public_profile=dict(profile),
+            cnft_mint=None,
+            status=list(ApplicationStatus)[0],
+            access_granted_at=None,
+            created_at=now,
+            updated_at=now,
+        )
+        for _ in range(count)
+    ]
+
+
+def _per_1k_ms(fn, rows: int) -> float:
+    return min(timeit.repeat(fn, number=10, repeat=5)) / 10 * 1000 * 1000 / rows
+
+
+def main(rows: int = 1000) -> None:
+    for label, schema, items in (
+        ("bounties", BountyResponse, _bounties(rows)),
+        ("applications", ApplicationResponse, _applications(rows)),
+    ):
+        adapter = TypeAdapter(list[schema])
+        renderer = RowRenderer(schema)
+
+        def stdlib():
+            validated = adapter.validate_python(items, from_attributes=True)
+            return json.dumps(jsonable_encoder(validated)).encode()
+
+        def type_adapter():
+            return adapter.dump_json(adapter.validate_python(items, from_attributes=True))
+
+        def row_renderer():
+            return ORJSONResponse(renderer.to_dicts(items)).body
+
+        assert json.loads(row_renderer()) == json.loads(type_adapter())
+        results = {
+            name: _per_1k_ms(fn, rows)
+            for name, fn in (
+                ("stdlib", stdlib),
+                ("type_adapter", type_adapter),
+                ("row_renderer", row_renderer),
+            )
+        }
+        baseline = results["stdlib"]
+        print(
+            f"{label:<13}"
+            + "  ".join(
+                f"{name} {ms:6.2f}ms ({baseline / ms:4.1f}x)" for name, ms in results.items()
+            )
+            + "  per 1k rows"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,34 @@
+"""index bounty listing keyset and skill filter
+
+Revision ID: 0003_bounty_listing_indexes
+Revises: 0002_extend_bounty_fields
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003_bounty_listing_indexes"
+down_revision = "0002_extend_bounty_fields"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_bounty_created_at_id", "bounties", ["created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_bounty_skills_normalized",
+        "bounties",
+        [sa.text("(lower(skills::text)::jsonb)")],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bounty_skills_normalized", table_name="bounties")
+    op.drop_index("ix_bounty_created_at_id", table_name="bounties")
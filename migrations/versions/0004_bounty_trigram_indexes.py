@@ -0,0 +1,50 @@
+"""trigram indexes for bounty substring filters
+
+Revision ID: 0004_bounty_trigram_indexes
+Revises: 0003_bounty_listing_indexes
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004_bounty_trigram_indexes"
+down_revision = "0003_bounty_listing_indexes"
+branch_labels = None
+depends_on = None
+
+
+TRIGRAM_INDEXES = (
+    ("ix_bounty_company_trgm", "company"),
+    ("ix_bounty_region_trgm", "region"),
+    ("ix_bounty_employment_type_trgm", "employment_type"),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for index_name, column in TRIGRAM_INDEXES:
+            op.create_index(
+                index_name,
+                "bounties",
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, _ in reversed(TRIGRAM_INDEXES):
+            op.drop_index(
+                index_name,
+                table_name="bounties",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,93 @@
+"""full-text search vector for bounties
+
+Revision ID: 0005_bounty_search_vector
+Revises: 0004_bounty_trigram_indexes
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from __future__ import annotations
+
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0005_bounty_search_vector"
+down_revision = "0004_bounty_trigram_indexes"
+branch_labels = None
+depends_on = None
+
+
+# Weighted search document; ``{row}`` is "NEW." inside the trigger. A later
+# change to the document needs a new migration that replaces the function
+# and re-runs the backfill.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce({row}title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce({row}company, '')), 'B') || "
+    "setweight(jsonb_to_tsvector('english', {row}skills, '[\"string\"]'), 'B') || "
+    "setweight(to_tsvector('english', coalesce({row}description, '')), 'C')"
+)
+BACKFILL_BATCH_ROWS = 5000
+
+
+def upgrade() -> None:
+    # A GENERATED ... STORED column would rewrite the table under ACCESS
+    # EXCLUSIVE. A nullable column without a default is a catalog-only change;
+    # the trigger keeps new writes current while existing rows are backfilled.
+    op.add_column("bounties", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+    op.execute(
+        f"""
+        CREATE FUNCTION bounties_search_vector_update() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR_SQL.format(row="NEW.")};
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER bounties_search_vector_update "
+        "BEFORE INSERT OR UPDATE OF title, company, skills, description ON bounties "
+        "FOR EACH ROW EXECUTE FUNCTION bounties_search_vector_update()"
+    )
+
+    backfill = sa.text(
+        f"UPDATE bounties SET search_vector = {SEARCH_VECTOR_SQL.format(row='')} "
+        "WHERE id IN (SELECT id FROM bounties WHERE id > :after ORDER BY id LIMIT :batch) "
+        "RETURNING id"
+    )
+    # Each batch commits on its own so row locks are held only briefly, and
+    # CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        after = uuid.UUID(int=0)
+        while True:
+            params = {"after": after, "batch": BACKFILL_BATCH_ROWS}
+            ids = bind.execute(backfill, params).scalars().all()
+            if not ids:
+                break
+            after = max(ids)
+        op.create_index(
+            "ix_bounty_search_vector",
+            "bounties",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_bounty_search_vector",
+            table_name="bounties",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.execute("DROP TRIGGER IF EXISTS bounties_search_vector_update ON bounties")
+    op.execute("DROP FUNCTION IF EXISTS bounties_search_vector_update()")
+    op.drop_column("bounties", "search_vector")
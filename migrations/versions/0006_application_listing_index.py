@@ -0,0 +1,28 @@
+"""index application listing keyset
+
+Revision ID: 0006_application_listing_index
+Revises: 0005_bounty_search_vector
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0006_application_listing_index"
+down_revision = "0005_bounty_search_vector"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_application_created_at_id",
+        "applications",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_application_created_at_id", table_name="applications")
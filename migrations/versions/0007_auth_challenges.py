@@ -0,0 +1,39 @@
+"""shared auth challenge store
+
+Revision ID: 0007_auth_challenges
+Revises: 0006_application_listing_index
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0007_auth_challenges"
+down_revision = "0006_application_listing_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "auth_challenges",
+        sa.Column("nonce", sa.String(length=64), nullable=False),
+        sa.Column("wallet", sa.Text(), nullable=False),
+        sa.Column("issued_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("purpose", sa.Text(), nullable=False),
+        sa.Column("domain", sa.Text(), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("nonce"),
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index(
+        "ix_auth_challenges_expires_at", "auth_challenges", ["expires_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_auth_challenges_expires_at", table_name="auth_challenges")
+    op.drop_table("auth_challenges")
@@ -0,0 +1,28 @@
+"""index auth challenges by wallet for per-wallet eviction
+
+Revision ID: 0008_auth_challenge_wallet_index
+Revises: 0007_auth_challenges
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0008_auth_challenge_wallet_index"
+down_revision = "0007_auth_challenges"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_auth_challenges_wallet_issued_at",
+        "auth_challenges",
+        ["wallet", "issued_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_auth_challenges_wallet_issued_at", table_name="auth_challenges")
@@ -0,0 +1,120 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models import Account, AccountRole
+from app.services.accounts import _upsert_accounts_stmt, get_or_create_accounts
+
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+class _RecordingSession:
+    """Stands in for AsyncSession: records statements, answers with accounts."""
+
+    def __init__(self) -> None:
+        self.info = {}
+        self.statements = []
+
+    async def scalars(self, stmt, execution_options=None):
+        self.statements.append(stmt)
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        rows = [value for name, value in params.items() if name.startswith("param_")]
+        wallets, roles = rows[0::2], rows[1::2]
+        accounts = [
+            Account(id=uuid.uuid4(), wallet=wallet, role=role)
+            for wallet, role in zip(wallets, roles)
+        ]
+        return _Result(accounts)
+
+
+class _Result:
+    def __init__(self, accounts) -> None:
+        self._accounts = accounts
+
+    def all(self):
+        return self._accounts
+
+
+def test_upsert_statement_never_rewrites_existing_rows():
+    sql = str(
+        _upsert_accounts_stmt([{"wallet": "w1", "role": AccountRole.CANDIDATE}]).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "ON CONFLICT (wallet) DO NOTHING" in sql
+    assert "DO UPDATE" not in sql
+    assert "UNION ALL" in sql
+
+
+def test_get_or_create_accounts_normalizes_dedupes_and_sorts():
+    session = _RecordingSession()
+    accounts = asyncio.run(
+        get_or_create_accounts(
+            session,
+            {
+                " wallet-b ": AccountRole.RECRUITER,
+                "wallet-a": AccountRole.CANDIDATE,
+                "wallet-b": AccountRole.CANDIDATE,
+            },
+        )
+    )
+
+    assert len(session.statements) == 1
+    params = session.statements[0].compile(dialect=postgresql.dialect()).params
+    inserted = [value for name, value in params.items() if name.startswith("param_")]
+    # The first role given for a wallet wins; rows are inserted in wallet order.
+    assert inserted == ["wallet-a", AccountRole.CANDIDATE, "wallet-b", AccountRole.RECRUITER]
+    assert sorted(accounts) == ["wallet-a", "wallet-b"]
+
+
+def test_get_or_create_accounts_rejects_blank_wallets():
+    with pytest.raises(ValueError):
+        asyncio.run(get_or_create_accounts(_RecordingSession(), {"  ": AccountRole.CANDIDATE}))
+    assert asyncio.run(get_or_create_accounts(_RecordingSession(), {})) == {}
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+def test_get_or_create_accounts_returns_one_row_per_wallet():
+    from sqlalchemy import func, select
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    existing, new = (f"{prefix}-{uuid.uuid4().hex}" for prefix in ("existing", "new"))
+
+    async def run() -> None:
+        engine = create_async_engine(TEST_DATABASE_URL)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            async with sessions() as session:
+                session.add(Account(wallet=existing, role=AccountRole.RECRUITER, display_name="x"))
+                await session.commit()
+
+            async with sessions() as session:
+                accounts = await get_or_create_accounts(
+                    session,
+                    {existing: AccountRole.CANDIDATE, new: AccountRole.CANDIDATE},
+                )
+                await session.commit()
+                assert set(accounts) == {existing, new}
+                # Existing accounts keep their role and display name.
+                assert accounts[existing].role == AccountRole.RECRUITER
+                assert accounts[existing].display_name == "x"
+                assert accounts[new].role == AccountRole.CANDIDATE
+
+                again = await get_or_create_accounts(
+                    session, {new: AccountRole.RECRUITER, f" {existing} ": AccountRole.CANDIDATE}
+                )
+                assert {wallet: account.id for wallet, account in again.items()} == {
+                    wallet: account.id for wallet, account in accounts.items()
+                }
+                count = await session.scalar(
+                    select(func.count()).where(Account.wallet.in_([existing, new]))
+                )
+                assert count == 2
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
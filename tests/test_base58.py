@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from app.auth.base58 import b58decode, b58encode
+
+
+def _reference_encode(data: bytes) -> str:
+    alphabet = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+    n = int.from_bytes(data, "big")
+    result = ""
+    while n > 0:
+        n, rem = divmod(n, 58)
+        result = alphabet[rem] + result
+    return "1" * (len(data) - len(data.lstrip(b"\x00"))) + result
+
+
+@pytest.mark.parametrize("size", [0, 1, 31, 32, 33, 64])
+def test_round_trip_matches_reference(size):
+    for data in (os.urandom(size), b"\x00" * size, b"\x00\x00" + os.urandom(size)):
+        encoded = b58encode(data)
+        assert encoded == _reference_encode(data)
+        assert b58decode(encoded) == data
+
+
+def test_decode_expected_length():
+    key = b"\x00" + os.urandom(31)
+    encoded = b58encode(key)
+    assert b58decode(encoded, 32) == key
+    with pytest.raises(ValueError):
+        b58decode(encoded, 64)
+    with pytest.raises(ValueError):
+        b58decode("1", 32)
+
+
+@pytest.mark.parametrize("bad", ["0OIl", "abc!", "héllo"])
+def test_decode_rejects_invalid_characters(bad):
+    with pytest.raises(ValueError):
+        b58decode(bad)
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from app.api.bounties import BountyBoardFilters
+from app.services.bounty_board import VersionedCache
+
+
+def test_concurrent_misses_share_one_load():
+    cache = VersionedCache(maxsize=8, ttl_seconds=60)
+    loads = 0
+
+    async def loader():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return b"page"
+
+    async def run():
+        results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(20)))
+        assert results == [b"page"] * 20
+        assert await cache.get_or_load("k", loader) == b"page"
+
+    asyncio.run(run())
+    assert loads == 1
+    assert cache.stats()["coalesced"] == 19
+
+
+def test_invalidation_drops_entries_and_racing_loads():
+    cache = VersionedCache(maxsize=8, ttl_seconds=60)
+    values = iter([b"old", b"new"])
+
+    async def run():
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_loader():
+            started.set()
+            await release.wait()
+            return next(values)
+
+        pending = asyncio.ensure_future(cache.get_or_load("k", slow_loader))
+        await started.wait()
+        cache.invalidate()
+        release.set()
+        # The caller still gets its result, but it is not cached.
+        assert await pending == b"old"
+
+        async def loader():
+            return next(values)
+
+        assert await cache.get_or_load("k", loader) == b"new"
+
+    asyncio.run(run())
+    assert cache.version == 1
+
+
+def test_failed_load_is_not_cached():
+    cache = VersionedCache(maxsize=8, ttl_seconds=60)
+
+    async def failing():
+        raise RuntimeError("db down")
+
+    async def ok():
+        return b"page"
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("k", failing)
+        assert await cache.get_or_load("k", ok) == b"page"
+
+    asyncio.run(run())
+
+
+def test_filters_normalize_case_insensitive_matches_only():
+    def filters(**overrides):
+        params = dict(
+            company=None,
+            region=None,
+            employment_type=None,
+            match="contains",
+            skill=None,
+            cursor=None,
+            limit=20,
+        )
+        params.update(overrides)
+        return BountyBoardFilters.normalized(**params)
+
+    assert filters(company="Acme", skill=" Rust ") == filters(company="acme", skill="rust")
+    assert filters(company="") == filters()
+    assert filters(company="Acme", match="exact") != filters(company="acme", match="exact")
+
+
+def test_listener_retries_failed_listen(monkeypatch):
+    from app.services import bounty_board
+
+    connections = []
+
+    class FakeConnection:
+        def __init__(self, fail: bool) -> None:
+            self.fail = fail
+            self.closed = False
+            self.listening = asyncio.Event()
+
+        def add_termination_listener(self, callback) -> None:
+            pass
+
+        async def add_listener(self, channel, callback) -> None:
+            if self.fail:
+                raise RuntimeError("LISTEN not supported")
+            self.listening.set()
+
+        def is_closed(self) -> bool:
+            return self.closed
+
+        async def close(self) -> None:
+            self.closed = True
+
+    second_connect = asyncio.Event()
+
+    async def connect(dsn):
+        connections.append(FakeConnection(fail=not connections))
+        if len(connections) == 2:
+            second_connect.set()
+        return connections[-1]
+
+    monkeypatch.setattr(bounty_board.asyncpg, "connect", connect)
+    monkeypatch.setattr(bounty_board, "_LISTEN_RETRY_SECONDS", (0,))
+
+    async def run():
+        task = asyncio.ensure_future(bounty_board._listen_forever())
+        await asyncio.wait_for(second_connect.wait(), 1)
+        await asyncio.wait_for(connections[1].listening.wait(), 1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert connections[0].closed
+    assert connections[1].closed
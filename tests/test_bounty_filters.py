@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.api.bounties import _escape_like, _text_filter
+from app.models import Bounty
+
+
+def _compiled(clause):
+    compiled = clause.compile(dialect=postgresql.dialect())
+    return str(compiled), list(compiled.params.values())
+
+
+def test_escape_like_escapes_wildcards_and_backslash():
+    assert _escape_like("100%_off") == "100\\%\\_off"
+    assert _escape_like("a\\b") == "a\\\\b"
+    # The backslash is escaped first, so escapes added for % are not doubled.
+    assert _escape_like("\\%") == "\\\\\\%"
+    assert _escape_like("plain text") == "plain text"
+
+
+@pytest.mark.parametrize(
+    "match,sql,pattern",
+    [
+        ("exact", "bounties.company = %(company_1)s::VARCHAR", "Ac%me"),
+        ("prefix", "bounties.company ILIKE %(company_1)s::VARCHAR ESCAPE '\\'", "Ac\\%me%"),
+        ("contains", "bounties.company ILIKE %(company_1)s::VARCHAR ESCAPE '\\'", "%Ac\\%me%"),
+    ],
+)
+def test_text_filter_modes(match, sql, pattern):
+    assert _compiled(_text_filter(Bounty.company, "Ac%me", match)) == (sql, [pattern])
@@ -0,0 +1,27 @@
+import time
+
+from app.services.cache import TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats() == {"size": 2, "hits": 3, "misses": 1}
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl_seconds=60)
+    cache.set("short", "x", ttl_seconds=0.01)
+    cache.set("never", "y", ttl_seconds=0)
+    time.sleep(0.02)
+
+    assert cache.get("short") is None
+    assert cache.get("never") is None
+    assert len(cache) == 0
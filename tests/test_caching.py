@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.api.caching import etag_matches, not_modified, rows_etag, set_cache_headers
+
+
+def _row(updated_at):
+    return SimpleNamespace(id=uuid.UUID(int=1), updated_at=updated_at)
+
+
+def test_rows_etag_tracks_updated_at_and_cursor():
+    now = datetime.now(timezone.utc)
+    etag = rows_etag([_row(now)], "cursor")
+    assert etag.startswith('W/"')
+    assert etag == rows_etag([_row(now)], "cursor")
+    assert etag != rows_etag([_row(now + timedelta(microseconds=1))], "cursor")
+    assert etag != rows_etag([_row(now)], None)
+
+
+def test_conditional_get():
+    app = FastAPI()
+    etag = rows_etag([_row(datetime(2025, 1, 1, tzinfo=timezone.utc))])
+
+    @app.get("/item")
+    async def item(request: Request):
+        if etag_matches(request, etag):
+            return not_modified(etag, "private, no-cache")
+        return {"ok": True}
+
+    @app.get("/headers")
+    async def headers(response: Response):
+        set_cache_headers(response, etag, "private, no-cache")
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert client.get("/item").status_code == 200
+    opaque = etag[2:]
+    for header in (etag, opaque, f'"other", {etag}', "*"):
+        r = client.get("/item", headers={"If-None-Match": header})
+        assert r.status_code == 304, header
+        assert r.content == b""
+        assert r.headers["etag"] == etag
+    assert client.get("/item", headers={"If-None-Match": '"other"'}).status_code == 200
+    assert client.get("/headers").headers["cache-control"] == "private, no-cache"
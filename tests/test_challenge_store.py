@@ -0,0 +1,131 @@
+import asyncio
+import os
+from datetime import timedelta
+
+import pytest
+
+from app.auth.auth import now_utc
+from app.auth.challenges import InMemoryChallengeStore, PostgresChallengeStore
+from app.schemas.auth import ChallengeRecord
+
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def _record(
+    nonce: str,
+    ttl_seconds: float = 300,
+    wallet: str = "TestWallet11111111111111111111111111111",
+) -> ChallengeRecord:
+    issued = now_utc()
+    return ChallengeRecord(
+        wallet=wallet,
+        nonce=nonce,
+        issued_at=issued,
+        expires_at=issued + timedelta(seconds=ttl_seconds),
+        purpose="Login",
+        domain="example.com",
+        message=f"Sign in\nNonce: {nonce}",
+    )
+
+
+async def _exercise_store(store) -> None:
+    rec = _record("nonce-abc")
+    await store.put(rec)
+
+    consumed = await store.consume("nonce-abc")
+    assert consumed is not None
+    assert consumed.wallet == rec.wallet
+    assert consumed.message == rec.message
+    assert consumed.expires_at == rec.expires_at
+
+    # A nonce can only be consumed once.
+    assert await store.consume("nonce-abc") is None
+    assert await store.consume("never-issued") is None
+
+
+def test_in_memory_store_consumes_once():
+    asyncio.run(_exercise_store(InMemoryChallengeStore()))
+
+
+def test_in_memory_store_drops_expired_without_sweeper():
+    store = InMemoryChallengeStore()
+    store.put_nowait(_record("stale", ttl_seconds=-1))
+    store.put_nowait(_record("fresh"))
+
+    assert store.consume_nowait("stale") is None
+    assert len(store) == 1
+
+
+def test_in_memory_store_evicts_oldest_at_limits():
+    store = InMemoryChallengeStore(max_outstanding=3, max_per_wallet=2)
+    store.put_nowait(_record("a1", wallet="wallet-a"))
+    store.put_nowait(_record("a2", wallet="wallet-a"))
+    # Flooding a wallet never locks its owner out; it only drops older challenges.
+    store.put_nowait(_record("a3", wallet="wallet-a"))
+    assert store.consume_nowait("a1") is None
+
+    store.put_nowait(_record("b1", wallet="wallet-b"))
+    store.put_nowait(_record("c1", wallet="wallet-c"))
+    assert len(store) == 3
+    assert store.consume_nowait("a2") is None
+    for nonce in ("a3", "b1", "c1"):
+        assert store.consume_nowait(nonce) is not None
+    assert len(store) == 0
+
+
+def test_in_memory_store_evicts_with_single_slot_per_wallet():
+    store = InMemoryChallengeStore(max_outstanding=1, max_per_wallet=1)
+    store.put_nowait(_record("a1", wallet="wallet-a"))
+    store.put_nowait(_record("a2", wallet="wallet-a"))
+    store.put_nowait(_record("b1", wallet="wallet-b"))
+    assert store.consume_nowait("a2") is None
+    assert store.consume_nowait("b1") is not None
+
+
+def test_in_memory_store_rejects_empty_limits():
+    for limits in ({"max_outstanding": 0}, {"max_per_wallet": 0}):
+        with pytest.raises(ValueError):
+            InMemoryChallengeStore(**limits)
+
+
+def test_in_memory_store_evicts_in_issue_order_at_capacity():
+    store = InMemoryChallengeStore(max_outstanding=100, max_per_wallet=2)
+    for i in range(1000):
+        store.put_nowait(_record(f"n{i}", wallet=f"wallet-{i}"))
+        if i % 3 == 1:
+            assert store.consume_nowait(f"n{i}") is not None
+    unconsumed = [f"n{i}" for i in range(1000) if i % 3 != 1]
+    assert len(store) == 100
+    # Consumed and evicted nonces leave nothing behind in the expiry slots.
+    assert sum(len(slot) for slot in store._slots.values()) == len(store)
+    assert store.consume_nowait(unconsumed[-101]) is None
+    assert all(store.consume_nowait(nonce) is not None for nonce in unconsumed[-100:])
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+def test_postgres_store_consumes_once():
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.models import AuthChallenge
+
+    async def run() -> None:
+        engine = create_async_engine(TEST_DATABASE_URL)
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(AuthChallenge.__table__.create, checkfirst=True)
+            store = PostgresChallengeStore(
+                async_sessionmaker(engine, expire_on_commit=False), max_per_wallet=2
+            )
+            await _exercise_store(store)
+
+            wallet = f"wallet-{os.getpid()}"
+            for nonce in ("p1", "p2", "p3"):
+                await store.put(_record(f"{wallet}-{nonce}", wallet=wallet))
+            assert await store.consume(f"{wallet}-p1") is None
+            assert await store.consume(f"{wallet}-p2") is not None
+            assert await store.consume(f"{wallet}-p3") is not None
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
@@ -1,10 +1,15 @@
+import asyncio
 import base64
+import os
+import uuid
 from datetime import datetime, timedelta, timezone
 
 import jwt
+import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.auth.base58 import b58encode as b58_encode
 from app.config import get_settings
 
 
@@ -20,25 +25,6 @@ JWT_SECRET = settings.JWT_SECRET
 JWT_ALG = settings.JWT_ALG
 
 
-# Base58 helpers matching app.auth.auth alphabet
-_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
-
-
-def b58_encode(b: bytes) -> str:
-    n = int.from_bytes(b, byteorder="big")
-    if n == 0:
-        # still may need to account for leading zeros
-        result = ""
-    else:
-        result = ""
-        while n > 0:
-            n, rem = divmod(n, 58)
-            result = _B58_ALPHABET[rem] + result
-    # Add one '1' for each leading 0x00
-    leading_zeros = len(b) - len(b.lstrip(b"\x00"))
-    return ("1" * leading_zeros) + result
-
-
 client = TestClient(app, base_url="https://testserver")
 
 
@@ -48,6 +34,14 @@ def test_root_ok():
     assert r.json() == {"status": "ok"}
 
 
+def test_db_pool_stats():
+    r = client.get("/health/db")
+    assert r.status_code == 200
+    stats = r.json()["primary"]
+    assert stats["size"] == settings.DB_POOL_SIZE
+    assert {"checked_out", "overflow", "acquire_wait_seconds_max", "acquire_timeouts"} <= set(stats)
+
+
 def _gen_wallet_and_signature(message: str):
     from nacl.signing import SigningKey
 
@@ -170,3 +164,295 @@ def test_auth_me_errors():
     r2 = client3.get("/auth/me", headers={"Authorization": "Bearer not-a-jwt"})
     assert r2.status_code == 401
     assert r2.json().get("detail") == "invalid token"
+
+
+def _issue_challenge(sk):
+    wallet = b58_encode(sk.verify_key.encode())
+    r = client.post("/auth/challenge", json={"wallet": wallet, "purpose": "Login"})
+    assert r.status_code == 200, r.text
+    return wallet, r.json()
+
+
+def _batch_verify_items(count):
+    from nacl.signing import SigningKey
+
+    sk = SigningKey.generate()
+    items = []
+    for _ in range(count):
+        wallet, challenge = _issue_challenge(sk)
+        sig = sk.sign(challenge["message"].encode("utf-8")).signature
+        items.append(
+            {
+                "wallet": wallet,
+                "nonce": challenge["nonce"],
+                "signature": base64.b64encode(sig).decode(),
+            }
+        )
+    return items
+
+
+def test_auth_verify_batch_reports_per_item():
+    good, bad = _batch_verify_items(2)
+    bad["signature"] = base64.b64encode(b"\x00" * 64).decode()
+    unknown = dict(good, nonce="never-issued")
+
+    r = client.post("/auth/verify/batch", json={"items": [good, bad, unknown]})
+    assert r.status_code == 200, r.text
+    ok, invalid, missing = r.json()["results"]
+
+    assert ok["ok"] is True and ok["wallet"] == good["wallet"]
+    decoded = jwt.decode(ok["token"], JWT_SECRET, algorithms=[JWT_ALG], options={"verify_aud": False})
+    assert decoded["sub"] == good["wallet"] and decoded["nonce"] == good["nonce"]
+
+    assert invalid["ok"] is False and invalid["error"] == "invalid signature"
+    assert missing["ok"] is False and missing["error"] == "unknown or expired nonce"
+
+    # Nonces are single-use across single and batch verification.
+    r2 = client.post("/auth/verify", json=good)
+    assert r2.status_code == 400
+
+
+def test_auth_verify_batch_process_pool(monkeypatch):
+    import app.auth.auth as auth_module
+
+    monkeypatch.setattr(auth_module, "AUTH_VERIFY_BATCH_PROCESS_THRESHOLD", 1)
+    monkeypatch.setattr(auth_module, "AUTH_VERIFY_PROCESSES", 2)
+    items = _batch_verify_items(3)
+    items[1]["signature"] = base64.b64encode(b"\x01" * 64).decode()
+    try:
+        r = client.post("/auth/verify/batch", json={"items": items})
+    finally:
+        auth_module.shutdown_verify_executor()
+    assert r.status_code == 200, r.text
+    assert [res["ok"] for res in r.json()["results"]] == [True, False, True]
+
+
+def _mint_test_token(wallet: str, exp_delta: timedelta) -> str:
+    now = datetime.now(timezone.utc)
+    payload = {
+        "sub": wallet,
+        "iss": settings.JWT_ISSUER,
+        "iat": int(now.timestamp()),
+        "exp": int((now + exp_delta).timestamp()),
+    }
+    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALG)
+
+
+def test_decode_jwt_cached_respects_exp():
+    from app.auth import auth as auth_module
+
+    wallet = "W" * 32
+    token = _mint_test_token(wallet, timedelta(minutes=5))
+    assert auth_module.decode_jwt_cached(token)["sub"] == wallet
+    hits = auth_module._jwt_cache.hits
+    assert auth_module.decode_jwt_cached(token)["sub"] == wallet
+    assert auth_module._jwt_cache.hits == hits + 1
+
+    expired = _mint_test_token(wallet, timedelta(seconds=-5))
+    for _ in range(2):
+        try:
+            auth_module.decode_jwt_cached(expired)
+        except jwt.ExpiredSignatureError:
+            pass
+        else:  # pragma: no cover
+            raise AssertionError("expired token was accepted")
+
+
+def test_write_routes_require_matching_wallet():
+    bounty = {
+        "recruiter_wallet": "R" * 32,
+        "title": "t",
+        "description": None,
+        "reward_amount": "1",
+        "company": "c",
+        "region": "r",
+        "employment_type": "contract",
+        "expires_at": None,
+    }
+    anon = TestClient(app, base_url="https://testserver")
+    r = anon.post("/bounties", json=bounty)
+    assert r.status_code == 401
+    assert r.json()["detail"] == "missing token"
+
+    r = anon.post("/bounties", json=bounty, headers={"Authorization": "Bearer not-a-jwt"})
+    assert r.status_code == 401
+    assert r.json()["detail"] == "invalid token"
+
+    token = _mint_test_token("X" * 32, timedelta(minutes=5))
+    r = anon.post("/bounties", json=bounty, headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 403
+
+    application = {
+        "bounty_id": "00000000-0000-0000-0000-000000000000",
+        "applicant_wallet": "A" * 32,
+        "referrer_wallet": None,
+        "public_profile": {
+            "experience_years": 1,
+            "region": "r",
+            "bio_short": "b",
+            "contact_price": "1",
+        },
+    }
+    r = anon.post("/applications", json=application, headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 403
+
+
+def test_presign_private_urls_limits():
+    anon = TestClient(app, base_url="https://testserver")
+    ids = [str(uuid.uuid4()) for _ in range(101)]
+    r = anon.post("/applications/private-urls", json={"application_ids": ids})
+    assert r.status_code == 401
+
+    token = _mint_test_token("R" * 32, timedelta(minutes=5))
+    r = anon.post(
+        "/applications/private-urls",
+        json={"application_ids": ids},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert r.status_code == 400
+
+
+async def _seed_private_url_fixtures(database_url: str, owner: str, other: str) -> dict:
+    from decimal import Decimal
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.models import (
+        Account,
+        AccountRole,
+        Application,
+        ApplicationPrivateVersion,
+        Bounty,
+        Deposit,
+        DepositStatus,
+    )
+
+    # Expects a migrated schema (``alembic upgrade head``).
+    engine = create_async_engine(database_url)
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            recruiter = Account(wallet=owner, role=AccountRole.RECRUITER)
+            session.add_all([recruiter, Account(wallet=other, role=AccountRole.RECRUITER)])
+            await session.flush()
+            bounty = Bounty(recruiter_id=recruiter.id, title="t", reward_amount=Decimal("1"))
+            session.add(bounty)
+            await session.flush()
+
+            def application(**kwargs) -> Application:
+                return Application(
+                    bounty_id=bounty.id, applicant_wallet="A" * 32, public_profile={}, **kwargs
+                )
+
+            apps = {
+                "granted": application(access_granted_at=datetime.now(timezone.utc)),
+                "deposit": application(),
+                "pending": application(),
+                "empty": application(access_granted_at=datetime.now(timezone.utc)),
+            }
+            session.add_all(apps.values())
+            await session.flush()
+            for name in ("granted", "deposit", "pending"):
+                version = ApplicationPrivateVersion(
+                    application_id=apps[name].id,
+                    s3_key=f"applications/{apps[name].id}/private/profile.json",
+                    payload_sha256=uuid.uuid4().hex * 2,
+                )
+                session.add(version)
+                await session.flush()
+                apps[name].private_current_version_id = version.id
+            for name, deposit_status in (
+                ("deposit", DepositStatus.CLEARED),
+                ("pending", DepositStatus.PENDING),
+            ):
+                session.add(
+                    Deposit(
+                        application_id=apps[name].id,
+                        recruiter_id=recruiter.id,
+                        amount=Decimal("1"),
+                        tx_signature="tx",
+                        status=deposit_status,
+                    )
+                )
+            await session.commit()
+            return {name: str(app.id) for name, app in apps.items()}
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL not set")
+def test_presign_private_urls_requires_granted_access(monkeypatch):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.api import applications as applications_api
+    from app.dependencies import get_db_session
+    from app.services.storage import PrivateStorageService
+
+    database_url = os.environ["TEST_DATABASE_URL"]
+    owner, other = (f"{prefix}{uuid.uuid4().hex}" for prefix in ("owner-", "other-"))
+    ids = asyncio.run(_seed_private_url_fixtures(database_url, owner, other))
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "AKIDEXAMPLE")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "secret")
+    storage = PrivateStorageService()
+    monkeypatch.setattr(applications_api, "get_private_storage_service", lambda: storage)
+    # NullPool: connections are opened on the TestClient's own event loop.
+    sessions = async_sessionmaker(create_async_engine(database_url, poolclass=NullPool))
+
+    async def test_session():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db_session] = test_session
+    try:
+        missing = str(uuid.uuid4())
+        body = {"application_ids": [*ids.values(), missing]}
+
+        def post(wallet: str) -> dict:
+            token = _mint_test_token(wallet, timedelta(minutes=5))
+            r = client.post(
+                "/applications/private-urls",
+                json=body,
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            assert r.status_code == 200, r.text
+            assert r.headers["cache-control"] == "private, no-store"
+            return {item["application_id"]: item for item in r.json()["results"]}
+
+        results = post(owner)
+        for name in ("granted", "deposit"):
+            assert results[ids[name]]["error"] is None
+            assert results[ids[name]]["url"].startswith("http")
+        assert results[ids["pending"]]["error"] == "contact access not granted"
+        assert results[ids["pending"]]["url"] is None
+        assert results[ids["empty"]]["error"] == "no private payload"
+        assert results[missing]["error"] == "application not found"
+
+        results = post(other)
+        for application_id in ids.values():
+            assert results[application_id]["error"] == "not the recruiter for this bounty"
+            assert results[application_id]["url"] is None
+    finally:
+        app.dependency_overrides.pop(get_db_session, None)
+
+
+def test_private_upload_rejects_oversized_payload():
+    token = _mint_test_token("A" * 32, timedelta(minutes=5))
+    r = client.post(
+        f"/applications/{uuid.uuid4()}/private-upload",
+        json={"sha256": "0" * 64, "size": get_settings().PRIVATE_PAYLOAD_MAX_BYTES + 1},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert r.status_code == 413
+
+
+def test_attachment_rejects_empty_body():
+    token = _mint_test_token("A" * 32, timedelta(minutes=5))
+    r = client.post(
+        f"/applications/{uuid.uuid4()}/attachments",
+        params={"filename": "cv.pdf"},
+        content=b"",
+        headers={"Authorization": f"Bearer {token}", "Content-Length": "0"},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "empty attachment"
@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.models import BountyStatus
+from app.schemas import BountyResponse
+from app.services.export import csv_header, encode_csv, encode_ndjson
+
+
+def _bounty(**overrides):
+    now = datetime(2024, 6, 7, tzinfo=timezone.utc)
+    data = dict(
+        id=uuid.uuid4(),
+        recruiter_id=uuid.uuid4(),
+        title="Senior Rust Engineer",
+        description="Line one,\nline two",
+        reward_amount=Decimal("7500.00"),
+        currency="USDC",
+        escrow_account=None,
+        company="Helios Labs",
+        region="Remote",
+        employment_type="full-time",
+        skills=["Rust", "Solana"],
+        status=BountyStatus.OPEN,
+        expires_at=None,
+        created_at=now,
+        updated_at=now,
+    )
+    data.update(overrides)
+    return SimpleNamespace(**data)
+
+
+def test_encode_ndjson_one_object_per_line():
+    rows = [_bounty(), _bounty(title="Auditor")]
+    lines = encode_ndjson(rows, BountyResponse).decode().splitlines()
+    assert [json.loads(line)["title"] for line in lines] == ["Senior Rust Engineer", "Auditor"]
+
+
+def test_encode_csv_matches_header_and_quotes_fields():
+    row = _bounty()
+    body = (csv_header(BountyResponse) + encode_csv([row], BountyResponse)).decode()
+    header, record = list(csv.reader(io.StringIO(body)))
+    assert header == list(BountyResponse.model_fields.keys())
+    values = dict(zip(header, record))
+    assert values["description"] == "Line one,\nline two"
+    assert json.loads(values["skills"]) == ["Rust", "Solana"]
+    assert values["escrow_account"] == ""
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from fastapi.testclient import TestClient
+
+from app.auth import keys as keys_module
+from app.auth.keys import JwtKeyset
+from app.main import app
+
+
+def _write_private(path, key):
+    path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+
+
+def _write_public(path, key):
+    path.write_bytes(
+        key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+
+
+def _claims():
+    now = datetime.now(timezone.utc)
+    return {"sub": "wallet", "iss": "test", "exp": int((now + timedelta(minutes=5)).timestamp())}
+
+
+def test_keyset_rotation(tmp_path):
+    old_key = ed25519.Ed25519PrivateKey.generate()
+    new_key = ec.generate_private_key(ec.SECP256R1())
+    _write_private(tmp_path / "old.pem", old_key)
+    _write_private(tmp_path / "new.pem", new_key)
+
+    with pytest.raises(ValueError):
+        JwtKeyset.from_directory(str(tmp_path))
+
+    before = JwtKeyset.from_directory(str(tmp_path), active_kid="old")
+    old_token = before.sign(_claims())
+    assert jwt.get_unverified_header(old_token) == {"alg": "EdDSA", "kid": "old", "typ": "JWT"}
+
+    _write_public(tmp_path / "old.pem", old_key)
+    after = JwtKeyset.from_directory(str(tmp_path), active_kid="new")
+    new_token = after.sign(_claims())
+    assert jwt.get_unverified_header(new_token)["alg"] == "ES256"
+
+    # Tokens from the retired key stay valid; the old keyset never saw "new".
+    assert after.verify(old_token, issuer="test")["sub"] == "wallet"
+    assert after.verify(new_token, issuer="test")["sub"] == "wallet"
+    with pytest.raises(jwt.InvalidTokenError):
+        before.verify(jwt.encode(_claims(), "s" * 32, algorithm="HS256"), issuer="test")
+
+    with pytest.raises(ValueError):
+        JwtKeyset.from_directory(str(tmp_path), active_kid="old")
+
+
+def test_keyset_rejects_algorithm_swap(tmp_path):
+    key = ed25519.Ed25519PrivateKey.generate()
+    _write_private(tmp_path / "k1.pem", key)
+    keyset = JwtKeyset.from_directory(str(tmp_path), hmac_secret="s" * 32)
+
+    forged = jwt.encode(_claims(), "s" * 32, algorithm="HS256", headers={"kid": "k1"})
+    with pytest.raises(jwt.InvalidTokenError):
+        keyset.verify(forged, issuer="test")
+    legacy = jwt.encode(_claims(), "s" * 32, algorithm="HS256")
+    assert keyset.verify(legacy, issuer="test")["sub"] == "wallet"
+
+
+def test_jwks_endpoint(tmp_path, monkeypatch):
+    _write_private(tmp_path / "k1.pem", ed25519.Ed25519PrivateKey.generate())
+    keyset = JwtKeyset.from_directory(str(tmp_path))
+    monkeypatch.setattr(keys_module, "_jwt_keyset", keyset)
+
+    client = TestClient(app, base_url="https://testserver")
+    r = client.get("/.well-known/jwks.json")
+    assert r.status_code == 200
+    assert "max-age=" in r.headers["cache-control"]
+    (jwk,) = r.json()["keys"]
+    assert jwk["kid"] == "k1" and jwk["alg"] == "EdDSA" and "d" not in jwk
+
+    public_key = jwt.PyJWK(jwk).key
+    token = keyset.sign(_claims())
+    assert jwt.decode(token, public_key, algorithms=["EdDSA"], issuer="test")["sub"] == "wallet"
+
+    r2 = client.get("/.well-known/jwks.json", headers={"If-None-Match": r.headers["etag"]})
+    assert r2.status_code == 304
+
+
+def test_keyset_settings_gate_hs256(tmp_path, monkeypatch):
+    from dataclasses import replace
+
+    _write_private(tmp_path / "k1.pem", ed25519.Ed25519PrivateKey.generate())
+    legacy = jwt.encode(_claims(), "s" * 32, algorithm="HS256")
+
+    def keyset_for(**overrides):
+        settings = replace(keys_module.get_settings(), JWT_KEYS_DIR=str(tmp_path), **overrides)
+        monkeypatch.setattr(keys_module, "get_settings", lambda: settings)
+        monkeypatch.setattr(keys_module, "_jwt_keyset", None)
+        return keys_module.get_jwt_keyset()
+
+    # HS256 is off by default once a keyset is configured.
+    with pytest.raises(jwt.InvalidTokenError):
+        keyset_for(JWT_SECRET="s" * 32).verify(legacy, issuer="test")
+
+    with pytest.raises(ValueError):
+        keyset_for(JWT_ACCEPT_HS256=True, JWT_SECRET=keys_module.Settings.JWT_SECRET)
+
+    keyset = keyset_for(JWT_ACCEPT_HS256=True, JWT_SECRET="s" * 32)
+    assert keyset.verify(legacy, issuer="test")["sub"] == "wallet"
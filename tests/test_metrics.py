@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.register(Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1)))
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value, '/a"b')
+
+    lines = registry.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/a\\"b",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a\\"b",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/a\\"b"} 4' in lines
+
+
+def test_metrics_endpoint_labels_by_route_template():
+    client = TestClient(app, base_url="https://testserver")
+    client.get("/applications/not-a-uuid")
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    body = r.text
+    assert (
+        'http_requests_total{method="GET",route="/applications/{application_id}",status="4xx"}'
+        in body
+    )
+    assert "not-a-uuid" not in body
+    assert 'db_pool_checked_out{pool="primary"}' in body
+    assert "auth_challenges_outstanding" in body
+    assert "storage_requests_in_flight 0" in body
+    assert 'presign_cache_requests_total{result="hit"}' in body
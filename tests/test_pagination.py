@@ -0,0 +1,138 @@
+import asyncio
+import os
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.api.pagination import (
+    decode_cursor,
+    decode_rank_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+    split_page,
+)
+from app.main import app
+
+
+client = TestClient(app, base_url="https://testserver")
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 6, 7, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    row_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+
+def test_rank_cursor_round_trip():
+    row_id = uuid.uuid4()
+    # ts_rank returns float4 values; these must survive the JSON round trip exactly.
+    for rank in (0.0, 0.0607927, 1e-20, 0.1 + 0.2):
+        assert decode_rank_cursor(encode_rank_cursor(rank, row_id)) == (rank, row_id)
+
+
+def test_rank_cursor_rejects_other_cursors():
+    created_at_cursor = encode_cursor(datetime.now(timezone.utc), uuid.uuid4())
+    for cursor in ("not-a-cursor", created_at_cursor):
+        with pytest.raises(HTTPException) as exc:
+            decode_rank_cursor(cursor)
+        assert exc.value.status_code == 400
+
+
+def test_split_page_emits_cursor_only_when_more_rows():
+    now = datetime.now(timezone.utc)
+    rows = [SimpleNamespace(created_at=now, id=uuid.uuid4()) for _ in range(3)]
+
+    page, next_cursor = split_page(rows, 3)
+    assert page == rows and next_cursor is None
+
+    page, next_cursor = split_page(rows, 2)
+    assert page == rows[:2]
+    assert decode_cursor(next_cursor) == (now, rows[1].id)
+
+
+def test_list_bounties_rejects_bad_paging_params():
+    r = client.get("/bounties", params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "invalid cursor"
+
+    r2 = client.get("/bounties", params={"limit": 0})
+    assert r2.status_code == 422
+
+
+def test_search_bounties_rejects_bad_paging_params():
+    r = client.get("/bounties/search", params={"q": "rust", "cursor": "not-a-cursor"})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "invalid cursor"
+
+    r2 = client.get("/bounties/search", params={"q": ""})
+    assert r2.status_code == 422
+
+
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL not set")
+def test_search_bounties_filters_and_pages_by_rank():
+    from decimal import Decimal
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.dependencies import get_read_db_session
+    from app.models import Account, AccountRole, Bounty
+
+    # Expects a migrated schema (``alembic upgrade head``).
+    engine = create_async_engine(os.environ["TEST_DATABASE_URL"], poolclass=NullPool)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    term = f"zq{uuid.uuid4().hex[:12]}"
+
+    async def seed() -> dict:
+        async with sessions() as session:
+            recruiter = Account(wallet=f"search-{term}", role=AccountRole.RECRUITER)
+            session.add(recruiter)
+            await session.flush()
+            bounties = {
+                "title": Bounty(title=f"{term} engineer"),
+                "company": Bounty(title="engineer", company=term),
+                "description": Bounty(title="engineer", description=f"uses {term}"),
+                "unrelated": Bounty(title="engineer", description="rust"),
+            }
+            for bounty in bounties.values():
+                bounty.recruiter_id = recruiter.id
+                bounty.reward_amount = Decimal("1")
+            session.add_all(bounties.values())
+            await session.commit()
+            return {name: str(bounty.id) for name, bounty in bounties.items()}
+
+    async def read_session():
+        async with sessions() as session:
+            yield session
+
+    ids = asyncio.run(seed())
+    app.dependency_overrides[get_read_db_session] = read_session
+    try:
+        seen = []
+        cursor = None
+        while True:
+            params = {"q": term, "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            r = client.get("/bounties/search", params=params)
+            assert r.status_code == 200, r.text
+            seen.extend(row["id"] for row in r.json())
+            cursor = r.headers.get("x-next-cursor")
+            if cursor is None:
+                break
+        # Weights A (title) > B (company) > C (description); no row repeats across pages.
+        assert seen == [ids["title"], ids["company"], ids["description"]]
+    finally:
+        app.dependency_overrides.pop(get_read_db_session, None)
+
+
+def test_list_applications_rejects_bad_filters():
+    r = client.get("/applications", params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400
+
+    r2 = client.get("/applications", params={"status": "not-a-status"})
+    assert r2.status_code == 422
@@ -0,0 +1,48 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.dependencies import reads_from_primary
+from app.middleware import READ_PRIMARY_COOKIE, ReadYourWritesMiddleware
+
+
+def _make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=5)
+
+    @app.get("/read")
+    async def read(request: Request):
+        return {"primary": reads_from_primary(request)}
+
+    @app.post("/write")
+    async def write():
+        return {"ok": True}
+
+    @app.post("/fail", status_code=400)
+    async def fail():
+        return {"ok": False}
+
+    return TestClient(app, base_url="https://testserver")
+
+
+def test_write_pins_reads_to_primary():
+    client = _make_client()
+    assert client.get("/read").json() == {"primary": False}
+    assert READ_PRIMARY_COOKIE not in client.get("/read").headers.get("set-cookie", "")
+
+    client.post("/fail")
+    assert client.get("/read").json() == {"primary": False}
+
+    r = client.post("/write")
+    assert f"{READ_PRIMARY_COOKIE}=1" in r.headers["set-cookie"]
+    assert "Max-Age=5" in r.headers["set-cookie"]
+    assert client.get("/read").json() == {"primary": True}
+
+
+def test_header_pins_reads_to_primary():
+    client = _make_client()
+    for value in ("1", "true", "TRUE", " yes "):
+        r = client.get("/read", headers={"X-Read-Primary": value})
+        assert r.json() == {"primary": True}, value
+    for value in ("0", "false", "no", ""):
+        r = client.get("/read", headers={"X-Read-Primary": value})
+        assert r.json() == {"primary": False}, value
@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.api.responses import ORJSONResponse, RowRenderer
+from app.models import Bounty, BountyStatus
+from app.schemas import BountyResponse
+
+
+def _bounty() -> Bounty:
+    now = datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+    return Bounty(
+        id=uuid.uuid4(),
+        recruiter_id=uuid.uuid4(),
+        title="Auditor",
+        description=None,
+        reward_amount=Decimal("1500.00"),
+        currency="USDC",
+        escrow_account=None,
+        company="Acme",
+        region="Remote",
+        employment_type="contract",
+        skills=["Rust"],
+        status=BountyStatus.OPEN,
+        expires_at=None,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_row_renderer_matches_pydantic_json():
+    rows = [_bounty(), _bounty()]
+    adapter = TypeAdapter(list[BountyResponse])
+    expected = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+    assert ORJSONResponse(RowRenderer(BountyResponse).to_dicts(rows)).body == expected
+
+
+def test_row_renderer_keeps_injected_headers():
+    injected = Response()
+    del injected.headers["content-length"]
+    injected.headers["X-Next-Cursor"] = "abc"
+    rendered = RowRenderer(BountyResponse).render([_bounty()], injected)
+    assert rendered.headers["x-next-cursor"] == "abc"
+    assert rendered.media_type == "application/json"
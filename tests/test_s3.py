@@ -0,0 +1,262 @@
+import asyncio
+import base64
+import hashlib
+import os
+import uuid
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlsplit
+
+import boto3
+import httpx
+import pytest
+from botocore.config import Config
+from botocore.credentials import Credentials
+
+from app.services import s3 as s3_module
+from app.services.s3 import AsyncS3Client, S3Error, S3Presigner
+from app.services.storage import PrivateStorageService, UploadTooLarge
+
+CREDENTIALS = Credentials("AKIDEXAMPLE", "secret")
+
+
+def _client(handler, **kwargs) -> AsyncS3Client:
+    return AsyncS3Client(
+        credentials=CREDENTIALS,
+        region="us-east-1",
+        endpoint_url="http://s3.test",
+        transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+
+
+def test_put_object_is_signed_and_retried_on_throttling():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(503 if len(seen) == 1 else 200)
+
+    async def run():
+        client = _client(handler, max_attempts=3)
+        await client.put_object("bucket", "a b/c.json", b"{}", "application/json")
+        await client.aclose()
+
+    asyncio.run(run())
+    assert len(seen) == 2
+    request = seen[-1]
+    assert request.url.raw_path == b"/bucket/a%20b/c.json"
+    assert request.headers["authorization"].startswith("AWS4-HMAC-SHA256 Credential=AKIDEXAMPLE/")
+    assert request.headers["content-type"] == "application/json"
+    assert request.content == b"{}"
+
+
+def test_payload_is_hashed_once_across_retries(monkeypatch):
+    body = os.urandom(128 * 1024)
+    hashed = []
+    real_sha256 = hashlib.sha256
+
+    def counting_sha256(data=b""):
+        if data is body:
+            hashed.append(data)
+        return real_sha256(data)
+
+    monkeypatch.setattr(s3_module.hashlib, "sha256", counting_sha256)
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers["x-amz-content-sha256"])
+        return httpx.Response(500 if len(seen) < 3 else 200)
+
+    async def run():
+        client = _client(handler, max_attempts=3)
+        await client.put_object("bucket", "part", body)
+        await client.aclose()
+
+    asyncio.run(run())
+    assert seen == [real_sha256(body).hexdigest()] * 3
+    assert len(hashed) == 1
+
+
+def test_client_errors_are_not_retried():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(403, content=b"<Error><Code>AccessDenied</Code></Error>")
+
+    async def run():
+        client = _client(handler, max_attempts=3)
+        with pytest.raises(S3Error) as exc:
+            await client.put_object("bucket", "key", b"x")
+        assert exc.value.status_code == 403
+        assert client.in_flight == 0
+
+    asyncio.run(run())
+    assert calls == 1
+
+
+@pytest.mark.parametrize(
+    "client_method,params,headers",
+    [
+        ("get_object", {"Bucket": "b", "Key": "applications/a b/é+1.json"}, None),
+        (
+            "put_object",
+            {"Bucket": "b", "Key": "k/profile.json", "ContentType": "application/json"},
+            {"Content-Type": "application/json"},
+        ),
+    ],
+)
+def test_presigner_matches_botocore(client_method, params, headers):
+    endpoint = "http://127.0.0.1:9000"
+    botocore_client = boto3.client(
+        "s3",
+        endpoint_url=endpoint,
+        aws_access_key_id="AKIDEXAMPLE",
+        aws_secret_access_key="secret/key+",
+        region_name="eu-west-2",
+        config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+    )
+    expected = botocore_client.generate_presigned_url(
+        client_method, Params=params, ExpiresIn=900
+    )
+    signed_at = parse_qs(urlsplit(expected).query)["X-Amz-Date"][0]
+    now = datetime.strptime(signed_at, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+
+    presigner = S3Presigner(
+        credentials=Credentials("AKIDEXAMPLE", "secret/key+"),
+        region="eu-west-2",
+        endpoint_url=endpoint,
+    )
+    method = "PUT" if client_method == "put_object" else "GET"
+    assert presigner.presign(method, "b", params["Key"], 900, headers, now=now) == expected
+
+
+def test_get_urls_are_reused_while_fresh(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "AKIDEXAMPLE")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "secret")
+    storage = PrivateStorageService()
+    urls = storage.generate_get_urls(["a/1", "a/2"])
+    again = storage.generate_get_url("a/1")
+    assert again.url == urls["a/1"].url
+    assert again.url != urls["a/2"].url
+    assert 0 < again.expires_in <= urls["a/1"].expires_in
+    assert storage.presign_cache_stats()["hits"] == 1
+
+
+def test_checked_put_signs_size_and_checksum(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "AKIDEXAMPLE")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "secret")
+    storage = PrivateStorageService()
+    storage._bucket_ensured = True
+    digest = hashlib.sha256(b"{}").hexdigest()
+
+    presigned = asyncio.run(storage.presign_checked_put("k/profile.json", digest, 2))
+    assert presigned.fields["Content-Length"] == "2"
+    assert base64.b64decode(presigned.fields["x-amz-checksum-sha256"]).hex() == digest
+    signed = parse_qs(urlsplit(presigned.url).query)["X-Amz-SignedHeaders"][0].split(";")
+    assert signed == sorted(name.lower() for name in [*presigned.fields, "host"])
+
+
+def _multipart_storage(monkeypatch, max_in_flight):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "AKIDEXAMPLE")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "secret")
+    storage = PrivateStorageService()
+    storage._bucket_ensured = True
+    calls = []
+    in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight
+        params = request.url.params
+        calls.append((request.method, dict(params), len(request.content)))
+        if request.method == "POST" and "uploads" in params:
+            return httpx.Response(
+                200,
+                content=b"<InitiateMultipartUploadResult><UploadId>u1</UploadId>"
+                b"</InitiateMultipartUploadResult>",
+            )
+        if request.method == "PUT" and "partNumber" in params:
+            in_flight += 1
+            max_in_flight[0] = max(max_in_flight[0], in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, headers={"ETag": f'"etag-{params["partNumber"]}"'})
+        return httpx.Response(204 if request.method == "DELETE" else 200)
+
+    storage._async_client = AsyncS3Client(
+        credentials=CREDENTIALS,
+        region="us-east-1",
+        endpoint_url="http://s3.test",
+        transport=httpx.MockTransport(handler),
+    )
+    return storage, calls
+
+
+async def _chunks(data: bytes, size: int = 256 * 1024):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def test_upload_stream_uses_bounded_multipart(monkeypatch):
+    max_in_flight = [0]
+    storage, calls = _multipart_storage(monkeypatch, max_in_flight)
+    storage._part_size = 5 * 1024 * 1024
+    storage._part_concurrency = 2
+    data = os.urandom(21 * 1024 * 1024 + 7)
+
+    upload = asyncio.run(storage.upload_stream("k/big.bin", _chunks(data)))
+    assert upload.size == len(data)
+    assert upload.sha256 == hashlib.sha256(data).hexdigest()
+
+    part_sizes = [size for method, params, size in calls if "partNumber" in params]
+    assert part_sizes == [5 * 1024 * 1024] * 4 + [1024 * 1024 + 7]
+    assert max_in_flight[0] == 2
+    method, params, _ = calls[-1]
+    assert (method, params) == ("POST", {"uploadId": "u1"})
+
+
+def test_upload_stream_aborts_oversized_upload(monkeypatch):
+    storage, calls = _multipart_storage(monkeypatch, [0])
+    storage._part_size = 5 * 1024 * 1024
+    body = _chunks(os.urandom(12 * 1024 * 1024))
+
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(storage.upload_stream("k/big.bin", body, max_bytes=11 * 1024 * 1024))
+    assert calls[-1][:2] == ("DELETE", {"uploadId": "u1"})
+
+
+def test_upload_stream_single_put_for_small_bodies(monkeypatch):
+    storage, calls = _multipart_storage(monkeypatch, [0])
+    upload = asyncio.run(storage.upload_stream("k/small.txt", _chunks(b"hello")))
+    assert upload.size == 5
+    assert [(method, params) for method, params, _ in calls] == [("PUT", {})]
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_S3_ENDPOINT_URL"),
+    reason="set TEST_S3_ENDPOINT_URL to a MinIO or moto server",
+)
+def test_put_object_against_s3_endpoint():
+    client = AsyncS3Client(
+        credentials=Credentials(
+            os.getenv("TEST_S3_ACCESS_KEY_ID", "test"),
+            os.getenv("TEST_S3_SECRET_ACCESS_KEY", "test"),
+        ),
+        region="us-east-1",
+        endpoint_url=os.environ["TEST_S3_ENDPOINT_URL"],
+    )
+    bucket = f"test-{uuid.uuid4().hex[:12]}"
+
+    async def run():
+        assert not await client.bucket_exists(bucket)
+        await client.create_bucket(bucket)
+        assert await client.bucket_exists(bucket)
+        await asyncio.gather(
+            *(client.put_object(bucket, f"k/{i}", b"payload") for i in range(10))
+        )
+        response = await client.request("GET", bucket, "k/3")
+        assert response.content == b"payload"
+        await client.aclose()
+
+    asyncio.run(run())
@@ -0,0 +1,67 @@
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.middleware import SqlStatsMiddleware
+from app.services import sql_stats
+
+engine = create_engine("sqlite://")
+
+
+def test_request_stats_flag_repeated_statements():
+    token = sql_stats.begin_request()
+    with engine.connect() as conn:
+        for i in range(sql_stats.SQL_N_PLUS_ONE_THRESHOLD):
+            conn.execute(text("SELECT :i"), {"i": i})
+        conn.execute(text("SELECT 'other'"))
+    stats = sql_stats.current_request_stats()
+    assert stats.count == sql_stats.SQL_N_PLUS_ONE_THRESHOLD + 1
+    assert list(stats.repeated()) == ["SELECT ?"]
+    sql_stats.end_request(token, "/test/n-plus-one")
+
+    assert sql_stats.current_request_stats() is None
+    totals = sql_stats.sql_stats_snapshot()["/test/n-plus-one"]
+    assert totals["requests"] == 1
+    assert totals["statements"] == sql_stats.SQL_N_PLUS_ONE_THRESHOLD + 1
+    assert totals["n_plus_one_requests"] == 1
+
+
+def test_middleware_sets_server_timing():
+    app = FastAPI()
+    app.add_middleware(SqlStatsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {"id": item_id}
+
+    r = TestClient(app).get("/items/7")
+    assert r.status_code == 200
+    assert r.headers["server-timing"].startswith("db;dur=")
+    assert r.headers["server-timing"].endswith('desc="2 queries"')
+    assert sql_stats.sql_stats_snapshot()["/items/{item_id}"]["statements"] == 2
+
+
+def test_middleware_omits_server_timing_on_shared_cacheable_responses():
+    app = FastAPI()
+    app.add_middleware(SqlStatsMiddleware)
+
+    @app.get("/board")
+    async def board(response: Response):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        response.headers["Cache-Control"] = "public, max-age=0, s-maxage=5"
+        return []
+
+    @app.get("/mine")
+    async def mine(response: Response):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        response.headers["Cache-Control"] = "private, no-cache"
+        return []
+
+    client = TestClient(app)
+    assert "server-timing" not in client.get("/board").headers
+    assert client.get("/mine").headers["server-timing"].startswith("db;dur=")